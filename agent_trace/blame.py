@@ -7,24 +7,43 @@ commit SHA, then either:
   - **Local mode:** runs attribution against ``.agent-trace/`` JSONL files
   - **Remote mode:** POSTs segment data to the ``/api/v1/blame`` endpoint
 
-No external dependencies — stdlib only.
+No external dependencies — stdlib only (``orjson`` is used when installed).
 """
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import gzip
+import http.client
+import io
 import json
+import marshal
 import os
+import re
+import struct
 import subprocess
 import sys
+import threading
 import urllib.error
+import urllib.parse
 import urllib.request
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Collection, Iterable
 
 from .config import get_auth_token, get_project_config, get_service_url
-from .ledger import load_local_ledgers
-from .trace import compute_content_hash
+from .jsonl import (
+    append_bytes,
+    iter_jsonl,
+    json_dumps_bytes,
+    json_dumps_indented,
+    json_loads,
+    replace_bytes,
+)
+from .ledger import _git_bytes, load_local_ledgers
+from .trace import compute_content_hash, compute_content_hash_bytes
 
 
 # ===================================================================
@@ -39,6 +58,36 @@ WEIGHT_RANGE_MATCH = 10
 WEIGHT_RANGE_OVERLAP = 5
 WEIGHT_TIMESTAMP = 5
 
+# Local scoring signals as bit flags; _SIGNAL_NAMES gives the order in
+# which they are reported.
+SIG_COMMIT_LINK = 1 << 0
+SIG_REVISION_PARENT = 1 << 1
+SIG_RANGE_MATCH = 1 << 2
+SIG_RANGE_OVERLAP = 1 << 3
+SIG_CONTENT_HASH = 1 << 4
+SIG_TIMESTAMP = 1 << 5
+
+_SIGNAL_NAMES = (
+    (SIG_COMMIT_LINK, "commit_link"),
+    (SIG_REVISION_PARENT, "revision_parent"),
+    (SIG_RANGE_MATCH, "range_match"),
+    (SIG_RANGE_OVERLAP, "range_overlap"),
+    (SIG_CONTENT_HASH, "content_hash"),
+    (SIG_TIMESTAMP, "timestamp_match"),
+)
+
+# Signal names for every possible bitmask, indexed by the mask itself
+_SIGNAL_NAME_TABLE = tuple(
+    tuple(name for bit, name in _SIGNAL_NAMES if mask & bit)
+    for mask in range(1 << len(_SIGNAL_NAMES))
+)
+
+# Everything but the timestamp is structural evidence
+_STRUCTURAL_SIGNALS = (
+    SIG_COMMIT_LINK | SIG_REVISION_PARENT | SIG_RANGE_MATCH
+    | SIG_RANGE_OVERLAP | SIG_CONTENT_HASH
+)
+
 
 # ===================================================================
 # Git helpers
@@ -46,33 +95,79 @@ WEIGHT_TIMESTAMP = 5
 
 def _git(*args: str, cwd: str | None = None) -> str | None:
     """Run a git command and return stripped stdout, or None on failure."""
+    out = _git_bytes(*args, cwd=cwd)
+    if out is None:
+        return None
     try:
-        result = subprocess.run(
-            ["git", *args],
-            capture_output=True, text=True, cwd=cwd, timeout=30,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return None
+        return out.decode().strip()
+    except UnicodeDecodeError:
+        return None
 
 
-def _git_blame_porcelain(
+# Seconds git blame may run, output streaming included, before it is killed
+_GIT_BLAME_TIMEOUT = 30
+
+
+def _git_blame_segments(
     file_path: str,
     *,
     start_line: int | None = None,
     end_line: int | None = None,
     cwd: str | None = None,
-) -> str | None:
-    """Run ``git blame --porcelain`` and return raw output."""
-    args = ["blame", "--porcelain"]
+) -> list[dict[str, Any]] | None:
+    """Run ``git blame --porcelain`` and group its output as it streams in.
+
+    git's stdout is read through a pipe and parsed into segments by
+    ``_parse_blame_segments`` line by line, so parsing overlaps with git
+    producing the output and neither the output nor per-line records are
+    held in memory.  Returns the segments, or None if git could not be run,
+    exited non-zero, or did not finish within ``_GIT_BLAME_TIMEOUT`` seconds
+    (it is killed then, even mid-stream).
+
+    ``--incremental`` would be smaller output but carries no line content;
+    reading it from the working tree instead is not equivalent, because
+    blame shows content after textconv and clean filters — and the content
+    hashes must match what git reports.
+    """
+    args = ["git", "blame", "--porcelain"]
     if start_line is not None and end_line is not None:
         args.extend(["-L", f"{start_line},{end_line}"])
     elif start_line is not None:
         args.extend(["-L", f"{start_line},{start_line}"])
     args.append(file_path)
-    return _git(*args, cwd=cwd)
+    try:
+        with subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+        ) as proc:
+            # The deadline covers the streaming read too: a stalled git
+            # (hung filter, slow filesystem, lock wait) is killed, which
+            # ends the read with EOF.
+            expired = threading.Event()
+
+            def _expire() -> None:
+                expired.set()
+                proc.kill()
+
+            timer = threading.Timer(_GIT_BLAME_TIMEOUT, _expire)
+            timer.daemon = True
+            timer.start()
+            try:
+                segments = _parse_blame_segments(proc.stdout)
+                returncode = proc.wait()
+            except BaseException:
+                proc.kill()
+                raise
+            finally:
+                timer.cancel()
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+    if returncode != 0 or expired.is_set():
+        return None
+    return segments
 
 
 def _get_parent_sha(commit_sha: str, cwd: str | None = None) -> str | None:
@@ -85,110 +180,282 @@ def _get_commit_date(commit_sha: str, cwd: str | None = None) -> str | None:
     return _git("log", "-1", "--format=%aI", commit_sha, cwd=cwd)
 
 
-# ===================================================================
-# Git blame porcelain parser
-# ===================================================================
+# A directory's work-tree root does not change while the process runs, so
+# successful lookups are remembered (e.g. across files blamed by the viewer).
+_git_root_memo: dict[str, str] = {}
 
-def _parse_blame_porcelain(raw: str) -> list[dict[str, Any]]:
-    """Parse ``git blame --porcelain`` output into per-line records.
 
-    Each record:
-        {
-            "commit_sha": "abc123...",
-            "orig_line": int,
-            "final_line": int,
-            "content": "line content",
-            "author": "...",
-            "author_time": int,     # unix timestamp
-            "summary": "...",
-            "filename": "...",
-        }
+def _git_root(cwd: str) -> str | None:
+    """``git rev-parse --show-toplevel`` for *cwd*, memoized on success."""
+    root = _git_root_memo.get(cwd)
+    if root is None:
+        root = _git("rev-parse", "--show-toplevel", cwd=cwd)
+        if root is not None:
+            _git_root_memo[cwd] = root
+    return root
+
+
+def _commit_metadata(
+    commit_sha: str,
+    cwd: str | None = None,
+) -> tuple[str | None, str | None]:
+    """Return ``(parent_sha, author_date)`` for a single commit (memoized)."""
+    known = _commit_meta_memo.get((cwd, commit_sha))
+    if known is not None:
+        return known
+    meta = _get_parent_sha(commit_sha, cwd), _get_commit_date(commit_sha, cwd)
+    _remember_commit_meta(cwd, commit_sha, meta)
+    return meta
+
+
+# git blame reports uncommitted (working tree) lines under the all-zero SHA
+_UNCOMMITTED_SHA = "0" * 40
+
+# Upper bound on concurrent per-commit git lookups
+_GIT_WORKERS = 8
+
+
+# Commit metadata persisted across runs (immutable per SHA, so entries
+# never need invalidating — only bounding).
+_COMMIT_META_CACHE_MAX = 10000
+
+# The same, kept in memory for the life of the process: (cwd, sha) ->
+# (parent_sha, author_date).  Spares long-lived callers such as the viewer
+# from re-reading the disk cache or re-running git on every blame.  Holds
+# at most _COMMIT_META_CACHE_MAX entries, evicting the oldest first.
+_commit_meta_memo: dict[tuple[str | None, str], tuple[str | None, str | None]] = {}
+_commit_meta_memo_lock = threading.Lock()
+
+
+def _remember_commit_meta(
+    cwd: str | None,
+    commit_sha: str,
+    meta: tuple[str | None, str | None],
+) -> None:
+    """Add a resolved commit to ``_commit_meta_memo``, evicting the oldest.
+
+    Lookups that failed (no author date) are not remembered.
     """
-    lines = raw.split("\n")
-    records: list[dict[str, Any]] = []
-    commit_info: dict[str, dict[str, Any]] = {}  # sha -> header fields
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line:
-            i += 1
+    if meta[1] is None:
+        return
+    with _commit_meta_memo_lock:
+        _commit_meta_memo[(cwd, commit_sha)] = meta
+        while len(_commit_meta_memo) > _COMMIT_META_CACHE_MAX:
+            del _commit_meta_memo[next(iter(_commit_meta_memo))]
+
+
+def _commit_meta_cache_path(project_dir: str) -> Path:
+    """Path of the on-disk commit metadata cache for *project_dir*."""
+    return Path(project_dir) / ".agent-trace" / ".cache" / "commit-meta.jsonl"
+
+
+def _load_commit_meta_cache(
+    project_dir: str,
+) -> dict[str, tuple[str | None, str | None]]:
+    """Load ``{sha: (parent_sha, author_date)}`` from the on-disk cache."""
+    cache: dict[str, tuple[str | None, str | None]] = {}
+    for rec in iter_jsonl(_commit_meta_cache_path(project_dir)):
+        if not isinstance(rec, dict):
             continue
+        sha = rec.get("sha")
+        if isinstance(sha, str) and sha:
+            cache.pop(sha, None)  # keep file order = write order
+            cache[sha] = (rec.get("parent"), rec.get("date"))
+    return cache
+
+
+def _store_commit_meta_cache(
+    project_dir: str,
+    cache: dict[str, tuple[str | None, str | None]],
+    new: dict[str, tuple[str | None, str | None]],
+) -> None:
+    """Append *new* entries to the on-disk cache, compacting past the bound.
+
+    *cache* is what ``_load_commit_meta_cache`` returned.  Once the file
+    would hold more than ``_COMMIT_META_CACHE_MAX`` entries it is rewritten
+    with only the most recently written ones.  Nothing is written for
+    projects without an ``.agent-trace/`` directory.
+    """
+    if not new or not (Path(project_dir) / ".agent-trace").is_dir():
+        return
+    path = _commit_meta_cache_path(project_dir)
+
+    def _encode(items) -> bytes:
+        return "".join(
+            json.dumps({"sha": sha, "parent": parent, "date": date}) + "\n"
+            for sha, (parent, date) in items
+        ).encode("utf-8")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if len(cache) + len(new) <= _COMMIT_META_CACHE_MAX:
+            append_bytes(path, _encode(new.items()))
+        else:
+            keep = list({**cache, **new}.items())[-_COMMIT_META_CACHE_MAX:]
+            replace_bytes(path, _encode(keep))
+    except OSError:
+        pass
 
-        # Each blamed line starts with: <sha> <orig_line> <final_line> [<num_lines>]
-        parts = line.split()
-        if len(parts) < 3:
-            i += 1
-            continue
 
-        sha = parts[0]
-        # Verify it looks like a SHA (40 hex chars)
-        if len(sha) != 40 or not all(c in "0123456789abcdef" for c in sha):
-            i += 1
+def _parse_cat_file_commits(
+    out: bytes,
+) -> dict[str, tuple[str | None, str | None]]:
+    """Parse ``git cat-file --batch`` output into ``{sha: (parent, date)}``.
+
+    Each object is ``<sha> <type> <size>\n<body>\n``; lookups git could
+    not resolve are a single ``<sha> missing`` line.  Non-commit objects
+    are skipped.  The parent is the first ``parent`` header (matching
+    ``git rev-parse <sha>^``) and the date is the ``author`` header's
+    timestamp in git's ``%aI`` form.
+    """
+    meta: dict[str, tuple[str | None, str | None]] = {}
+    pos = 0
+    end = len(out)
+    while pos < end:
+        nl = out.find(b"\n", pos)
+        if nl < 0:
+            break
+        header = out[pos:nl].split()
+        pos = nl + 1
+        if len(header) != 3:
+            continue  # "<sha> missing" / "<sha> ambiguous"
+        try:
+            size = int(header[2])
+        except ValueError:
+            break
+        body = out[pos:pos + size]
+        pos += size + 1  # object body plus its trailing newline
+        if header[1] != b"commit":
             continue
 
-        orig_line = int(parts[1])
-        final_line = int(parts[2])
-        # num_lines present only for the first line of a group
-        is_first_in_group = len(parts) >= 4
-
-        i += 1
-
-        # If this is the first time we see this commit, parse header lines
-        if sha not in commit_info:
-            info: dict[str, Any] = {}
-            while i < len(lines):
-                hline = lines[i]
-                if hline.startswith("\t"):
-                    break
-                if hline.startswith("author "):
-                    info["author"] = hline[7:]
-                elif hline.startswith("author-time "):
-                    try:
-                        info["author_time"] = int(hline[12:])
-                    except ValueError:
-                        pass
-                elif hline.startswith("summary "):
-                    info["summary"] = hline[8:]
-                elif hline.startswith("filename "):
-                    info["filename"] = hline[9:]
-                i += 1
-            commit_info[sha] = info
+        parent: str | None = None
+        date: str | None = None
+        # Headers end at the first blank line; the message follows.
+        for hline in body.split(b"\n\n", 1)[0].split(b"\n"):
+            key, _, value = hline.partition(b" ")
+            if key == b"parent" and parent is None:
+                parent = value.decode("ascii", "replace")
+            elif key == b"author":
+                date = _git_date_iso(value)
+        meta[header[0].decode("ascii")] = (parent, date)
+    return meta
+
+
+def _git_date_iso(ident: bytes) -> str | None:
+    """Format the date of a git ident (``Name <email> <ts> <tz>``) like ``%aI``."""
+    try:
+        ts, tz = ident.rsplit(b" ", 2)[-2:]
+        offset = int(tz[1:3]) * 60 + int(tz[3:5])
+        if tz[:1] == b"-":
+            offset = -offset
+        return datetime.fromtimestamp(
+            int(ts), timezone(timedelta(minutes=offset)),
+        ).isoformat()
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _prefetch_commit_metadata(
+    shas: set[str],
+    cwd: str | None = None,
+) -> dict[str, tuple[str | None, str | None]]:
+    """Fetch parent SHA and author date for many commits in one git call.
+
+    Commits resolved earlier in this process, or present in the project's
+    on-disk cache, are served from those.  The rest are written to a
+    single ``git cat-file --batch`` instead of two subprocesses per commit;
+    an unknown SHA only yields a ``missing`` line there rather than failing
+    the whole batch.  Commits the batch does not cover are looked up
+    individually on a small thread pool, since the work is subprocess I/O.
+    Newly resolved commits are added to both caches.  Returns
+    ``{sha: (parent_sha, author_date)}``.
+    """
+    meta: dict[str, tuple[str | None, str | None]] = {}
+    if _UNCOMMITTED_SHA in shas:
+        meta[_UNCOMMITTED_SHA] = (None, None)
+    pending: list[str] = []
+    for sha in sorted(shas):
+        if sha == _UNCOMMITTED_SHA:
+            continue
+        known = _commit_meta_memo.get((cwd, sha))
+        if known is not None:
+            meta[sha] = known
         else:
-            # Subsequent lines for known commit: skip to content line
-            while i < len(lines) and not lines[i].startswith("\t"):
-                hline = lines[i]
-                if hline.startswith("filename "):
-                    commit_info[sha]["filename"] = hline[9:]
-                i += 1
-
-        # Content line (starts with \t)
-        content = ""
-        if i < len(lines) and lines[i].startswith("\t"):
-            content = lines[i][1:]  # strip leading tab
-            i += 1
-
-        info = commit_info.get(sha, {})
-        records.append({
-            "commit_sha": sha,
-            "orig_line": orig_line,
-            "final_line": final_line,
-            "content": content,
-            "author": info.get("author", ""),
-            "author_time": info.get("author_time"),
-            "summary": info.get("summary", ""),
-            "filename": info.get("filename", ""),
-        })
+            pending.append(sha)
+    if not pending:
+        return meta
+
+    disk_cache = _load_commit_meta_cache(cwd) if cwd else {}
+    wanted: list[str] = []
+    for sha in pending:
+        if sha in disk_cache:
+            meta[sha] = disk_cache[sha]
+        else:
+            wanted.append(sha)
+    if wanted:
+        _resolve_commit_metadata(wanted, meta, cwd)
+        if cwd:
+            # A missing date means git could not resolve the commit; don't
+            # persist failures.
+            _store_commit_meta_cache(cwd, disk_cache, {
+                sha: meta[sha] for sha in wanted if meta[sha][1] is not None
+            })
 
-    return records
+    for sha in pending:
+        _remember_commit_meta(cwd, sha, meta[sha])
+    return meta
+
+
+def _resolve_commit_metadata(
+    wanted: list[str],
+    meta: dict[str, tuple[str | None, str | None]],
+    cwd: str | None,
+) -> None:
+    """Look *wanted* commits up with git and add them to *meta*."""
+    out = _git_bytes(
+        "cat-file", "--batch",
+        cwd=cwd, input="".join(f"{sha}\n" for sha in wanted).encode("ascii"),
+    )
+    if out:
+        meta.update(_parse_cat_file_commits(out))
+
+    missing = [s for s in wanted if s not in meta]
+    if len(missing) == 1:
+        meta[missing[0]] = _commit_metadata(missing[0], cwd)
+    elif missing:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(_GIT_WORKERS, len(missing)),
+        ) as pool:
+            for sha, result in zip(
+                missing, pool.map(lambda s: _commit_metadata(s, cwd), missing),
+            ):
+                meta[sha] = result
 
 
 # ===================================================================
-# Segment grouping
+# Git blame porcelain parser
 # ===================================================================
 
-def _group_into_segments(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Group consecutive blame records that share the same commit SHA.
+# Entry header: <sha> <orig_line> <final_line> [<num_lines>]
+_HEADER_RE = re.compile(rb"([0-9a-f]{40}) (\d+) (\d+)(?: \d+)?$")
+
+# Porcelain header keys kept per commit -> segment field
+_PORCELAIN_FIELDS = {
+    b"author": "author",
+    b"author-time": "author_time",
+    b"summary": "summary",
+    b"filename": "filename",
+}
+
+
+def _parse_blame_segments(
+    source: bytes | Iterable[bytes],
+) -> list[dict[str, Any]]:
+    """Parse ``git blame --porcelain`` output into commit segments.
+
+    *source* is either the complete output or an iterable of its lines
+    (e.g. git's stdout pipe).  Consecutive lines from the same commit are
+    grouped as they are parsed; no per-line records are built.
 
     Returns segments:
         {
@@ -197,7 +464,7 @@ def _group_into_segments(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
             "end_line": int,           # current (final) line number
             "orig_start_line": int,    # original line number in the commit
             "orig_end_line": int,      # original line number in the commit
-            "content_lines": ["line1", "line2", ...],
+            "content_lines": [b"line1", b"line2", ...],
             "author": "...",
             "author_time": int | None,
             "summary": "...",
@@ -208,40 +475,84 @@ def _group_into_segments(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
     were in the file version stored by the commit.  These are needed for
     ledger lookups because the ledger records line numbers at commit time,
     while subsequent commits can shift the current (final) positions.
-    """
-    if not records:
-        return []
 
+    ``content_lines`` stay as git's raw bytes (minus a trailing CR): they
+    are only ever hashed, see ``_content_hash_for_segment``.
+
+    A state machine over one line iterator: each ``<sha> <orig> <final>``
+    header pulls the following header lines from the same iterator up to
+    its \t-prefixed content line.  Header fields are decoded once per
+    commit (the first time its SHA is seen).
+    """
+    commit_info: dict[bytes, dict[str, Any]] = {}  # raw sha -> header fields
     segments: list[dict[str, Any]] = []
     current: dict[str, Any] | None = None
+    current_info: dict[str, Any] | None = None
 
-    for rec in records:
-        if (
-            current is not None
-            and current["commit_sha"] == rec["commit_sha"]
-            and current["end_line"] + 1 == rec["final_line"]
-        ):
-            current["end_line"] = rec["final_line"]
-            current["orig_end_line"] = rec["orig_line"]
-            current["content_lines"].append(rec["content"])
+    it = iter(io.BytesIO(source) if isinstance(source, bytes) else source)
+    match_header = _HEADER_RE.match
+    for line in it:
+        # Each blamed line starts with: <sha> <orig_line> <final_line> [<num_lines>]
+        m = match_header(line)
+        if m is None:
+            continue
+        raw_sha, orig, final = m.group(1, 2, 3)
+        orig_line = int(orig)
+        final_line = int(final)
+
+        info = commit_info.get(raw_sha)
+        is_new_commit = info is None
+        if is_new_commit:
+            # One interned str per commit, shared by all of its segments
+            info = commit_info[raw_sha] = {
+                "commit_sha": sys.intern(raw_sha.decode("ascii")),
+            }
+
+        # Header lines up to the content line (starts with \t).  A commit's
+        # full header block is only emitted the first time it appears;
+        # later entries carry at most ``previous`` and a ``filename``
+        # override, so only that field is read for them.
+        content = b""
+        for hline in it:
+            if hline[-1:] == b"\n":
+                hline = hline[:-1]
+            if hline[:1] == b"\t":
+                if hline[-1:] == b"\r":
+                    hline = hline[:-1]
+                content = hline[1:]
+                break
+            key, sep, value = hline.partition(b" ")
+            field = _PORCELAIN_FIELDS.get(key) if sep else None
+            if field is None or (not is_new_commit and field != "filename"):
+                continue
+            if field == "author_time":
+                try:
+                    info[field] = int(value)
+                except ValueError:
+                    pass
+            else:
+                info[field] = value.decode("utf-8", "replace")
+
+        # Extend the open segment, or start a new one
+        if info is current_info and current["end_line"] + 1 == final_line:
+            current["end_line"] = final_line
+            current["orig_end_line"] = orig_line
+            current["content_lines"].append(content)
         else:
-            if current is not None:
-                segments.append(current)
+            current_info = info
             current = {
-                "commit_sha": rec["commit_sha"],
-                "start_line": rec["final_line"],
-                "end_line": rec["final_line"],
-                "orig_start_line": rec["orig_line"],
-                "orig_end_line": rec["orig_line"],
-                "content_lines": [rec["content"]],
-                "author": rec.get("author", ""),
-                "author_time": rec.get("author_time"),
-                "summary": rec.get("summary", ""),
-                "filename": rec.get("filename", ""),
+                "commit_sha": info["commit_sha"],
+                "start_line": final_line,
+                "end_line": final_line,
+                "orig_start_line": orig_line,
+                "orig_end_line": orig_line,
+                "content_lines": [content],
+                "author": info.get("author", ""),
+                "author_time": info.get("author_time"),
+                "summary": info.get("summary", ""),
+                "filename": info.get("filename", ""),
             }
-
-    if current is not None:
-        segments.append(current)
+            segments.append(current)
 
     return segments
 
@@ -250,9 +561,42 @@ def _group_into_segments(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
 # Content hash (single implementation: trace.compute_content_hash)
 # ===================================================================
 
-def _content_hash_for_segment(content_lines: list[str]) -> str:
-    """Content hash for a blame segment; uses same normalization as trace storage."""
-    return compute_content_hash("\n".join(content_lines))
+# Blank-only segments normalize to "" (trailing newlines are stripped)
+_EMPTY_CONTENT_HASH = compute_content_hash("")
+
+
+def _content_hash_for_segment(content_lines: list[bytes]) -> str:
+    """Content hash for a blame segment; uses same normalization as trace storage.
+
+    The raw lines are joined and hashed as bytes, without a decode/encode
+    round trip.  Invalid UTF-8 is hashed as if decoded with U+FFFD
+    replacements, like the text the line would display as.
+    """
+    if not any(content_lines):
+        return _EMPTY_CONTENT_HASH
+    data = b"\n".join(content_lines)
+    if not data.isascii():
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError:
+            data = data.decode("utf-8", "replace").encode("utf-8")
+    return compute_content_hash_bytes(data)
+
+
+# Blames with at least this many lines hash their segments on a thread
+# pool (hashlib releases the GIL for large buffers); smaller ones are
+# cheaper to hash inline than to hand off.
+_PARALLEL_HASH_MIN_LINES = 20000
+
+
+def _segment_content_hashes(segments: list[dict[str, Any]]) -> list[str]:
+    """``_content_hash_for_segment`` for each segment, in order."""
+    contents = [seg["content_lines"] for seg in segments]
+    workers = min(os.cpu_count() or 1, len(contents))
+    if workers > 1 and sum(map(len, contents)) >= _PARALLEL_HASH_MIN_LINES:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_content_hash_for_segment, contents))
+    return [_content_hash_for_segment(lines) for lines in contents]
 
 
 # ===================================================================
@@ -277,70 +621,146 @@ def _load_conversation_summary(url: str | None, max_chars: int = 200) -> str | N
         return None
 
 
+def _load_conversation_summaries(
+    urls: Iterable[str | None],
+) -> dict[str, str | None]:
+    """``_load_conversation_summary`` for each distinct URL, keyed by URL.
+
+    Only file:// URLs touch the disk; several of them are read in parallel.
+    """
+    summaries: dict[str, str | None] = {}
+    files: list[str] = []
+    for url in urls:
+        if url and url not in summaries:
+            summaries[url] = None
+            if url.startswith("file://"):
+                files.append(url)
+    if len(files) > 1:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(files)),
+        ) as pool:
+            summaries.update(zip(files, pool.map(_load_conversation_summary, files)))
+    elif files:
+        summaries[files[0]] = _load_conversation_summary(files[0])
+    return summaries
+
+
 # ===================================================================
 # Local data loading
 # ===================================================================
 
-def _load_local_traces(project_dir: str) -> list[dict[str, Any]]:
-    """Load all traces from .agent-trace/traces.jsonl."""
-    traces_path = Path(project_dir) / ".agent-trace" / "traces.jsonl"
-    if not traces_path.exists():
-        return []
-    traces: list[dict[str, Any]] = []
+# Parsed JSONL stores by path, reused while the file's (mtime, size) is
+# unchanged — saves re-parsing in long-lived callers such as the viewer.
+_jsonl_cache: dict[Path, tuple[int, int, list[Any]]] = {}
+
+# Stores at least this large also get an on-disk snapshot of their parsed
+# records (.agent-trace/.cache/<name>.marshal) so later CLI runs skip JSON
+# decoding.  The header carries the marshal format and Python version that
+# wrote it (the format may change between interpreters) and the source's
+# (mtime_ns, size).  marshal rather than pickle: it loads plain data only
+# and never runs code.
+_JSONL_SNAPSHOT_MIN_BYTES = 64 * 1024
+_JSONL_SNAPSHOT_HEADER = struct.Struct("<4sHBBqq")
+_JSONL_SNAPSHOT_MAGIC = b"ATJ1"
+_JSONL_SNAPSHOT_FORMAT = (_JSONL_SNAPSHOT_MAGIC, marshal.version, *sys.version_info[:2])
+
+
+def _jsonl_snapshot_path(path: Path) -> Path:
+    """On-disk snapshot location for the JSONL store at *path*."""
+    return path.parent / ".cache" / f"{path.name}.marshal"
+
+
+def _load_jsonl_snapshot(path: Path, st: os.stat_result) -> list[Any] | None:
+    """Records from *path*'s snapshot if it matches *st*, else None."""
     try:
-        for line in traces_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    traces.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
+        with open(_jsonl_snapshot_path(path), "rb") as f:
+            data = f.read()
     except OSError:
+        return None
+    header = _JSONL_SNAPSHOT_HEADER
+    if len(data) < header.size:
+        return None
+    if header.unpack_from(data) != (*_JSONL_SNAPSHOT_FORMAT, st.st_mtime_ns, st.st_size):
+        return None
+    try:
+        records = marshal.loads(memoryview(data)[header.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return records if isinstance(records, list) else None
+
+
+def _store_jsonl_snapshot(path: Path, st: os.stat_result, records: list[Any]) -> None:
+    """Write *records* as *path*'s snapshot (atomically; errors ignored)."""
+    snap = _jsonl_snapshot_path(path)
+    try:
+        data = marshal.dumps(records)
+        snap.parent.mkdir(exist_ok=True)
+        replace_bytes(snap, _JSONL_SNAPSHOT_HEADER.pack(
+            *_JSONL_SNAPSHOT_FORMAT, st.st_mtime_ns, st.st_size,
+        ) + data)
+    except (OSError, ValueError):
         pass
-    return traces
 
 
-def _load_local_commit_links(project_dir: str) -> list[dict[str, Any]]:
-    """Load all commit links from .agent-trace/commit-links.jsonl."""
-    links_path = Path(project_dir) / ".agent-trace" / "commit-links.jsonl"
-    if not links_path.exists():
-        return []
-    links: list[dict[str, Any]] = []
+def _load_jsonl_cached(path: Path) -> list[Any]:
+    """``iter_jsonl`` as a list, served from ``_jsonl_cache`` when fresh.
+
+    Large stores fall back to their on-disk snapshot before re-parsing.
+    The returned list is shared between calls and must not be mutated.
+    """
     try:
-        for line in links_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    links.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
+        st = path.stat()
     except OSError:
-        pass
-    return links
+        _jsonl_cache.pop(path, None)
+        return []
+    cached = _jsonl_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    records = None
+    if st.st_size >= _JSONL_SNAPSHOT_MIN_BYTES:
+        records = _load_jsonl_snapshot(path, st)
+    if records is None:
+        records = list(iter_jsonl(path))
+        if st.st_size >= _JSONL_SNAPSHOT_MIN_BYTES:
+            _store_jsonl_snapshot(path, st, records)
+    _jsonl_cache[path] = (st.st_mtime_ns, st.st_size, records)
+    return records
+
+
+def _load_local_traces(project_dir: str) -> list[dict[str, Any]]:
+    """Load all traces from .agent-trace/traces.jsonl."""
+    return _load_jsonl_cached(Path(project_dir) / ".agent-trace" / "traces.jsonl")
+
+
+def _load_local_commit_links(project_dir: str) -> list[dict[str, Any]]:
+    """Load all commit links from .agent-trace/commit-links.jsonl."""
+    return _load_jsonl_cached(Path(project_dir) / ".agent-trace" / "commit-links.jsonl")
 
 
 # ===================================================================
 # Local attribution engine  (simplified version of service-side logic)
 # ===================================================================
 
-def _compute_tier(score: float, signals: list[str]) -> int | None:
-    """Map a numeric score + signal list to a confidence tier (1-6) or None.
+def _signal_names(signals: int) -> list[str]:
+    """Expand a signal bitmask into its list of signal names."""
+    return list(_SIGNAL_NAME_TABLE[signals])
+
+
+def _compute_tier(score: float, signals: int) -> int | None:
+    """Map a numeric score + signal bitmask to a confidence tier (1-6) or None.
 
     Requires at least one *structural* signal (commit_link, content_hash,
-    revision_parent, revision_ancestor, range_match, range_overlap).
+    revision_parent, range_match, range_overlap).
     Timestamp alone is never sufficient — it would false-positive on every
     manual edit made within the same 24-hour window as any AI trace.
     """
     if score <= 0:
         return None
     # Require at least one structural signal beyond just timestamp
-    _STRUCTURAL = {
-        "commit_link", "content_hash", "revision_parent",
-        "revision_ancestor", "range_match", "range_overlap",
-    }
-    if not any(s in _STRUCTURAL for s in signals):
+    if not signals & _STRUCTURAL_SIGNALS:
         return None
-    if score >= 95 and "commit_link" in signals and "content_hash" in signals:
+    both = SIG_COMMIT_LINK | SIG_CONTENT_HASH
+    if score >= 95 and signals & both == both:
         return 1
     if score >= 80:
         return 2
@@ -360,128 +780,181 @@ def _tier_to_confidence(tier: int | None) -> float:
     return {1: 1.0, 2: 0.999, 3: 0.95, 4: 0.85, 5: 0.70, 6: 0.40}.get(tier, 0.0)
 
 
-def _hashes_match(hash_a: str, hash_b: str) -> bool:
-    """Compare two content hashes, handling different-length prefixes."""
-    a = hash_a.removeprefix("sha256:").lower()
-    b = hash_b.removeprefix("sha256:").lower()
-    min_len = min(len(a), len(b))
-    if min_len == 0:
+@functools.lru_cache(maxsize=4096)
+def _norm_hash(content_hash: str) -> str:
+    """Normalize a content hash for comparison: no ``sha256:`` prefix, lowercase."""
+    return content_hash.removeprefix("sha256:").lower()
+
+
+def _content_hash_matches(norm_hash: str, index: dict[int, frozenset[str]]) -> bool:
+    """Whether a normalized hash matches any hash in a ``_file_entry_index``.
+
+    Hashes of different lengths match when the shorter is a prefix of the
+    longer (old 8-char hashes vs current 16-char ones), so each length
+    group needs one set lookup — only stored hashes longer than *norm_hash*
+    need a scan.
+    """
+    if not norm_hash:
         return False
-    return a[:min_len] == b[:min_len]
+    n = len(norm_hash)
+    for length, hashes in index.items():
+        if length <= n:
+            if norm_hash[:length] in hashes:
+                return True
+        elif any(h.startswith(norm_hash) for h in hashes):
+            return True
+    return False
 
 
 def _find_matching_file(files: list[dict[str, Any]], file_path: str) -> dict[str, Any] | None:
-    """Find the file entry in a trace's files array matching file_path."""
+    """Find the file entry in a trace's files array matching file_path.
+
+    The first entry whose path equals *file_path* or is a suffix / extension
+    of it wins.  Callers in the attribution engine go through
+    ``_cached_file_match``, so each trace is scanned once per blame.
+    """
     for f in files:
         if not isinstance(f, dict):
             continue
         trace_path = f.get("path", "")
-        if trace_path == file_path:
-            return f
+        # Equal paths satisfy both endswith() checks
         if trace_path.endswith(file_path) or file_path.endswith(trace_path):
             return f
     return None
 
 
-def _trace_touches_file(trace: dict[str, Any], file_path: str) -> bool:
-    """Return True if this trace's files array contains an entry for *file_path*.
+def _cached_file_match(
+    cache: dict[int, dict[str, Any] | None],
+    trace: dict[str, Any],
+    file_path: str,
+) -> dict[str, Any] | None:
+    """``_find_matching_file`` for *trace*, memoized in *cache* by trace identity.
 
-    Commit links associate a commit with traces that touched *any* changed file.
-    When blaming file F, we must only consider traces that actually touch F.
+    *file_path* must be the same for every call sharing a cache.  Keyed by
+    object identity rather than trace id: ids are not guaranteed unique in
+    traces.jsonl, and duplicates may list different files.
     """
-    files_data = trace.get("files") or []
-    if not isinstance(files_data, list):
-        return False
-    return _find_matching_file(files_data, file_path) is not None
+    key = id(trace)
+    if key not in cache:
+        files_data = trace.get("files") or []
+        cache[key] = (
+            _find_matching_file(files_data, file_path)
+            if isinstance(files_data, list) else None
+        )
+    return cache[key]
 
 
-def _collect_ranges(file_entry: dict[str, Any]) -> list[tuple[int, int]]:
-    """Collect all (start_line, end_line) ranges from a file entry.
+def _line_range(entry: dict[str, Any]) -> tuple[int, int] | None:
+    """Return an entry's ``(start_line, end_line)``, or None if unusable.
 
-    Same logic as agent-trace-service/attribution._collect_ranges:
-    - Top-level file entry start_line/end_line
-    - Conversation-level start_line/end_line
-    - Inside conversation ranges: conv['ranges'][i] (trace.py format)
-    - Inside changes: change start_line/end_line
+    Plain ints (what trace.py writes) are taken as-is; anything else goes
+    through ``int()``.
     """
-    ranges: list[tuple[int, int]] = []
-
-    # Top-level range on the file entry
-    if "start_line" in file_entry and "end_line" in file_entry:
-        try:
-            ranges.append((int(file_entry["start_line"]), int(file_entry["end_line"])))
-        except (ValueError, TypeError):
-            pass
-
-    # Ranges inside conversations (including conv["ranges"][] — trace.py format)
-    for conv in file_entry.get("conversations", []):
-        if not isinstance(conv, dict):
-            continue
-        if "start_line" in conv and "end_line" in conv:
-            try:
-                ranges.append((int(conv["start_line"]), int(conv["end_line"])))
-            except (ValueError, TypeError):
-                pass
-        for r in conv.get("ranges", []):
-            if isinstance(r, dict) and "start_line" in r and "end_line" in r:
-                try:
-                    ranges.append((int(r["start_line"]), int(r["end_line"])))
-                except (ValueError, TypeError):
-                    pass
-
-    # Ranges inside changes
-    for change in file_entry.get("changes", []):
-        if not isinstance(change, dict):
-            continue
-        if "start_line" in change and "end_line" in change:
-            try:
-                ranges.append((int(change["start_line"]), int(change["end_line"])))
-            except (ValueError, TypeError):
-                pass
+    start = entry.get("start_line")
+    end = entry.get("end_line")
+    if type(start) is int and type(end) is int:
+        return start, end
+    if start is None or end is None:
+        return None
+    try:
+        return int(start), int(end)
+    except (ValueError, TypeError):
+        return None
 
-    return ranges
 
+def _collect_ranges_and_hashes(
+    file_entry: dict[str, Any],
+) -> tuple[list[tuple[int, int]], list[str]]:
+    """Collect all line ranges and content hashes from a file entry.
 
-def _extract_content_hashes(file_entry: dict[str, Any]) -> list[str]:
-    """Extract all content hashes from a file entry.
+    One walk over the entry for both.  Ranges follow
+    agent-trace-service/attribution._collect_ranges:
+    - Top-level file entry start_line/end_line
+    - Conversation-level start_line/end_line
+    - Inside conversation ranges: conv['ranges'][i] (trace.py format)
+    - Inside changes: change start_line/end_line
 
-    Same sources as agent-trace-service/attribution._extract_content_hash:
+    Hashes follow agent-trace-service/attribution._extract_content_hash:
     - Conversation ranges: conv['ranges'][i]['content_hash'] (trace.py stores here)
     - Conversation-level: conv['content_hash']
     - Change-level: change['content_hash']
     - File-level: file_entry['content_hash']
 
-    We collect all and match the segment hash against any; service picks the
-    one that covers the line. Result is equivalent for attribution.
+    We collect all hashes and match the segment hash against any; service
+    picks the one that covers the line. Result is equivalent for attribution.
+    Hashes are returned normalized (see ``_norm_hash``).
     """
+    ranges: list[tuple[int, int]] = []
     hashes: list[str] = []
 
-    # Conversation ranges first (trace.py format — hashes live here)
+    # Top-level range on the file entry
+    rng = _line_range(file_entry)
+    if rng is not None:
+        ranges.append(rng)
+
+    # Conversations (including conv["ranges"][] — trace.py format, where
+    # the hashes live)
     for conv in file_entry.get("conversations", []):
         if not isinstance(conv, dict):
             continue
+        rng = _line_range(conv)
+        if rng is not None:
+            ranges.append(rng)
         for r in conv.get("ranges", []):
-            if isinstance(r, dict):
-                ch = r.get("content_hash")
-                if ch:
-                    hashes.append(ch)
+            if not isinstance(r, dict):
+                continue
+            rng = _line_range(r)
+            if rng is not None:
+                ranges.append(rng)
+            ch = r.get("content_hash")
+            if ch and isinstance(ch, str):
+                hashes.append(_norm_hash(ch))
         ch = conv.get("content_hash")
-        if ch:
-            hashes.append(ch)
+        if ch and isinstance(ch, str):
+            hashes.append(_norm_hash(ch))
 
-    # Changes, then file-level
+    # Changes, then file-level hash
     for change in file_entry.get("changes", []):
         if not isinstance(change, dict):
             continue
+        rng = _line_range(change)
+        if rng is not None:
+            ranges.append(rng)
         ch = change.get("content_hash")
-        if ch:
-            hashes.append(ch)
+        if ch and isinstance(ch, str):
+            hashes.append(_norm_hash(ch))
 
     ch = file_entry.get("content_hash")
-    if ch:
-        hashes.append(ch)
+    if ch and isinstance(ch, str):
+        hashes.append(_norm_hash(ch))
+
+    return ranges, hashes
 
-    return hashes
+
+def _file_entry_index(
+    file_entry: dict[str, Any],
+) -> tuple[int, int, list[tuple[int, int]], dict[int, frozenset[str]]]:
+    """Return ``(lo, hi, ranges, hashes_by_len)`` for a trace file entry.
+
+    ``lo``/``hi`` bound every range widened by the 5-line overlap margin, so
+    a line outside them can skip the per-range walk (``lo > hi`` when the
+    entry has no ranges).  *hashes_by_len* groups the entry's content
+    hashes into sets by length for ``_content_hash_matches``.
+    """
+    ranges, hashes = _collect_ranges_and_hashes(file_entry)
+    by_len: dict[int, set[str]] = {}
+    for h in hashes:
+        if h:
+            by_len.setdefault(len(h), set()).add(h)
+    hashes_by_len = {n: frozenset(hs) for n, hs in by_len.items()}
+    if not ranges:
+        return 1, 0, ranges, hashes_by_len
+    return (
+        min(start for start, _ in ranges) - 5,
+        max(end for _, end in ranges) + 5,
+        ranges,
+        hashes_by_len,
+    )
 
 
 def _score_trace_local(
@@ -492,17 +965,27 @@ def _score_trace_local(
     blame_commit: str,
     blame_parent: str | None,
     has_commit_link: bool,
-    linked_trace_ids: list[str],
-) -> tuple[float, list[str]]:
-    """Score a candidate trace against a blamed line.  Local-data variant."""
+    linked_trace_ids: Collection[str],
+    entry_cache: dict[int, tuple[Any, ...]] | None = None,
+    file_match: dict[int, dict[str, Any] | None] | None = None,
+) -> tuple[float, int]:
+    """Score a candidate trace against a blamed line.  Local-data variant.
+
+    Returns ``(score, signals)`` with *signals* as a ``SIG_*`` bitmask.
+
+    *entry_cache* and *file_match*, when given, memoize ``_file_entry_index``
+    and the trace's matching file entry by object identity; they must not
+    outlive the traces being scored.
+    """
     score: float = 0.0
-    signals: list[str] = []
+    signals = 0
     trace_id = trace.get("id", "")
+    blame_hash = _norm_hash(content_hash) if content_hash else ""
 
     # --- Commit link match ---
     if has_commit_link and trace_id in linked_trace_ids:
         score += WEIGHT_COMMIT_LINK
-        signals.append("commit_link")
+        signals |= SIG_COMMIT_LINK
 
     # --- VCS revision match ---
     vcs = trace.get("vcs") or {}
@@ -510,55 +993,72 @@ def _score_trace_local(
     if trace_revision and blame_parent:
         if trace_revision == blame_parent:
             score += WEIGHT_REVISION_PARENT
-            signals.append("revision_parent")
-        elif len(trace_revision) >= 7 and len(blame_parent) >= 7:
-            ml = min(len(trace_revision), len(blame_parent))
-            if trace_revision[:ml] == blame_parent[:ml]:
+            signals |= SIG_REVISION_PARENT
+        elif (
+            isinstance(trace_revision, str)
+            and len(trace_revision) >= 7 and len(blame_parent) >= 7
+        ):
+            # Abbreviated SHAs: the shorter must prefix the longer
+            if len(trace_revision) < len(blame_parent):
+                prefix_match = blame_parent.startswith(trace_revision)
+            else:
+                prefix_match = trace_revision.startswith(blame_parent)
+            if prefix_match:
                 score += WEIGHT_REVISION_PARENT
-                signals.append("revision_parent")
+                signals |= SIG_REVISION_PARENT
 
     # --- File & line range match ---
-    files_data = trace.get("files") or []
-    matched_file = _find_matching_file(files_data, file_path)
+    if file_match is None:
+        matched_file = _find_matching_file(trace.get("files") or [], file_path)
+    else:
+        matched_file = _cached_file_match(file_match, trace, file_path)
     if matched_file:
-        ranges = _collect_ranges(matched_file)
-        range_hit = False
-        for start, end in ranges:
-            if start <= line_number <= end:
+        if entry_cache is None:
+            index = _file_entry_index(matched_file)
+        else:
+            index = entry_cache.get(id(matched_file))
+            if index is None:
+                index = entry_cache[id(matched_file)] = _file_entry_index(matched_file)
+        lo, hi, ranges, hash_index = index
+        # The first range within 5 lines decides: exact hit or near overlap.
+        near = None
+        if lo <= line_number <= hi:
+            near = next(
+                ((start, end) for start, end in ranges
+                 if start - 5 <= line_number <= end + 5),
+                None,
+            )
+        if near is not None:
+            if near[0] <= line_number <= near[1]:
                 score += WEIGHT_RANGE_MATCH
-                signals.append("range_match")
-                range_hit = True
-                break
-            if (start - 5) <= line_number <= (end + 5):
+                signals |= SIG_RANGE_MATCH
+            else:
                 score += WEIGHT_RANGE_OVERLAP
-                signals.append("range_overlap")
-                range_hit = True
-                break
+                signals |= SIG_RANGE_OVERLAP
 
         # --- Content hash match ---
-        if content_hash:
-            file_hashes = _extract_content_hashes(matched_file)
-            for fh in file_hashes:
-                if _hashes_match(content_hash, fh):
-                    score += WEIGHT_CONTENT_HASH
-                    signals.append("content_hash")
-                    break
+        if blame_hash and _content_hash_matches(blame_hash, hash_index):
+            score += WEIGHT_CONTENT_HASH
+            signals |= SIG_CONTENT_HASH
 
     # --- Timestamp match ---
     trace_ts = trace.get("timestamp")
     if trace_ts:
         score += WEIGHT_TIMESTAMP
-        signals.append("timestamp_match")
+        signals |= SIG_TIMESTAMP
 
     return score, signals
 
 
-def _extract_trace_meta(
+def _trace_file_meta(
     trace: dict[str, Any],
     file_path: str,
-    line_number: int,
+    file_match: dict[int, dict[str, Any] | None] | None = None,
 ) -> dict[str, Any]:
-    """Extract display metadata from a local trace."""
+    """Display metadata for a local trace that does not depend on the line.
+
+    *file_match* is an optional ``_cached_file_match`` cache for *file_path*.
+    """
     meta: dict[str, Any] = {
         "trace_id": trace.get("id"),
     }
@@ -573,7 +1073,10 @@ def _extract_trace_meta(
         meta["tool"] = tool
 
     files_data = trace.get("files") or []
-    matched_file = _find_matching_file(files_data, file_path)
+    if file_match is None:
+        matched_file = _find_matching_file(files_data, file_path)
+    else:
+        matched_file = _cached_file_match(file_match, trace, file_path)
 
     if matched_file:
         # Search conversations in the matched file entry
@@ -591,8 +1094,75 @@ def _extract_trace_meta(
             if meta.get("model_id") and meta.get("conversation_url"):
                 break
 
+    # Fallback: search ALL file entries for model/conversation if still missing
+    if not meta.get("model_id") or not meta.get("conversation_url"):
+        for fe in files_data:
+            if not isinstance(fe, dict) or fe is matched_file:
+                continue
+            for conv in fe.get("conversations", []):
+                if not isinstance(conv, dict):
+                    continue
+                contributor = conv.get("contributor") or {}
+                if contributor.get("model_id") and not meta.get("model_id"):
+                    meta["model_id"] = contributor["model_id"]
+                if conv.get("url") and not meta.get("conversation_url"):
+                    meta["conversation_url"] = conv["url"]
+            if meta.get("model_id") and meta.get("conversation_url"):
+                break
+
+    return meta
+
+
+def _cached_trace_meta(
+    cache: dict[int, dict[str, Any]],
+    trace: dict[str, Any],
+    file_path: str,
+    file_match: dict[int, dict[str, Any] | None] | None = None,
+) -> dict[str, Any]:
+    """``_trace_file_meta`` memoized by trace identity for one *file_path*.
+
+    The returned dict is shared; callers must copy it before modifying.
+    """
+    meta = cache.get(id(trace))
+    if meta is None:
+        meta = cache[id(trace)] = _trace_file_meta(trace, file_path, file_match)
+    return meta
+
+
+def _extract_trace_meta(
+    trace: dict[str, Any],
+    file_path: str,
+    line_number: int,
+    file_match: dict[int, dict[str, Any] | None] | None = None,
+    entry_cache: dict[int, tuple[Any, ...]] | None = None,
+    meta_cache: dict[int, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Extract display metadata from a local trace.
+
+    *file_match* is an optional ``_cached_file_match`` cache for *file_path*;
+    *entry_cache* is the ``_score_trace_local`` file entry cache and
+    *meta_cache* a ``_cached_trace_meta`` cache.  Only the matched range
+    depends on *line_number*.
+    """
+    if meta_cache is None:
+        meta = _trace_file_meta(trace, file_path, file_match)
+    else:
+        meta = dict(_cached_trace_meta(meta_cache, trace, file_path, file_match))
+
+    if file_match is None:
+        matched_file = _find_matching_file(trace.get("files") or [], file_path)
+    else:
+        matched_file = _cached_file_match(file_match, trace, file_path)
+
+    if matched_file:
         # Best range
-        ranges = _collect_ranges(matched_file)
+        if entry_cache is None:
+            ranges = _collect_ranges_and_hashes(matched_file)[0]
+        else:
+            index = entry_cache.get(id(matched_file))
+            if index is None:
+                index = entry_cache[id(matched_file)] = _file_entry_index(matched_file)
+            ranges = index[2]
         best = None
         best_dist = float("inf")
         for start, end in ranges:
@@ -609,22 +1179,6 @@ def _extract_trace_meta(
         if best:
             meta["matched_range"] = {"start_line": best[0], "end_line": best[1]}
 
-    # Fallback: search ALL file entries for model/conversation if still missing
-    if not meta.get("model_id") or not meta.get("conversation_url"):
-        for fe in files_data:
-            if not isinstance(fe, dict) or fe is matched_file:
-                continue
-            for conv in fe.get("conversations", []):
-                if not isinstance(conv, dict):
-                    continue
-                contributor = conv.get("contributor") or {}
-                if contributor.get("model_id") and not meta.get("model_id"):
-                    meta["model_id"] = contributor["model_id"]
-                if conv.get("url") and not meta.get("conversation_url"):
-                    meta["conversation_url"] = conv["url"]
-            if meta.get("model_id") and meta.get("conversation_url"):
-                break
-
     return meta
 
 
@@ -636,9 +1190,13 @@ def _ranges_overlap(
     return attr_start <= seg_end and attr_end >= seg_start
 
 
-def _attribution_type_label(attr_type: str) -> str:
-    """Map ledger attribution type to display label."""
-    return {"ai": "AI", "human": "Human", "mixed": "Mixed"}.get(attr_type, attr_type)
+# Ledger attribution type -> (display label, tier, confidence, content hash
+# match).  Unknown types display as themselves with no tier.
+_LEDGER_ATTR_PROFILE: dict[str, tuple[str, int | None, float, bool]] = {
+    "ai": ("AI", 1, 1.0, True),
+    "human": ("Human", None, 0.0, False),
+    "mixed": ("Mixed", 3, 0.95, False),
+}
 
 
 def _attribute_from_ledger(
@@ -674,13 +1232,33 @@ def _attribute_from_ledger(
             if tid:
                 trace_by_id[tid] = t
 
+    # commit sha -> (entries sorted by start, starts, running max of ends)
+    index_by_commit: dict[
+        str, tuple[list[dict[str, Any]], list[int], list[int]]
+    ] = {}
+
     for seg in blame_segments:
         commit_sha = seg["commit_sha"]
         ledger = ledgers.get(commit_sha)
 
         if ledger and file_path in ledger.get("files", {}):
-            file_ledger = ledger["files"][file_path]
-            line_attrs = file_ledger.get("line_attributions", [])
+            index = index_by_commit.get(commit_sha)
+            if index is None:
+                file_ledger = ledger["files"][file_path]
+                line_attrs = sorted(
+                    file_ledger.get("line_attributions", []),
+                    key=lambda x: x.get("start_line", 0),
+                )
+                starts = [la.get("start_line", 0) for la in line_attrs]
+                max_ends: list[int] = []
+                running = None
+                for la in line_attrs:
+                    la_end = la.get("end_line", 0)
+                    if running is None or la_end > running:
+                        running = la_end
+                    max_ends.append(running)
+                index = index_by_commit[commit_sha] = (line_attrs, starts, max_ends)
+            line_attrs, starts, max_ends = index
 
             # Original line range for this segment (as recorded in the commit)
             orig_start = seg.get("orig_start_line", seg["start_line"])
@@ -689,8 +1267,12 @@ def _attribute_from_ledger(
             offset = seg["start_line"] - orig_start
 
             # Collect ALL overlapping ledger entries using ORIGINAL line numbers.
+            # Entries before ``lo`` all end before the segment and entries
+            # from ``hi`` on all start after it.
+            lo = bisect_left(max_ends, orig_start)
+            hi = bisect_right(starts, orig_end)
             overlapping: list[tuple[int, int, dict[str, Any]]] = []
-            for la in sorted(line_attrs, key=lambda x: x.get("start_line", 0)):
+            for la in line_attrs[lo:hi]:
                 la_start = la.get("start_line", 0)
                 la_end = la.get("end_line", 0)
                 if _ranges_overlap(la_start, la_end, orig_start, orig_end):
@@ -704,15 +1286,16 @@ def _attribute_from_ledger(
                     final_start = clamped_orig_start + offset
                     final_end = clamped_orig_end + offset
                     attr_type = la.get("type", "unknown")
-                    is_ai = attr_type == "ai"
-                    is_mixed = attr_type == "mixed"
+                    label, tier, confidence, is_ai = _LEDGER_ATTR_PROFILE.get(
+                        attr_type, (attr_type, None, 0.0, False),
+                    )
                     trace_id = la.get("trace_id")
                     trace_rec = trace_by_id.get(trace_id) if trace_id else None
                     attributed.append({
                         "start_line": final_start,
                         "end_line": final_end,
-                        "tier": 1 if is_ai else (3 if is_mixed else None),
-                        "confidence": 1.0 if is_ai else (0.95 if is_mixed else 0.0),
+                        "tier": tier,
+                        "confidence": confidence,
                         "trace_id": trace_id,
                         "timestamp": trace_rec.get("timestamp") if trace_rec else None,
                         "model_id": la.get("model_id"),
@@ -729,31 +1312,35 @@ def _attribute_from_ledger(
                         "commit_link_match": True,
                         "content_hash_match": is_ai,
                         "source": "ledger",
-                        "attribution_label": _attribution_type_label(attr_type),
+                        "attribution_label": label,
                     })
 
                 # If there are gaps in ledger coverage within this segment,
                 # pass those uncovered line ranges to the heuristic path.
+                # Gap segments carry only the keys the heuristic and remote
+                # paths read, rather than a full copy of the blame segment.
                 covered_orig_start = overlapping[0][0]
                 covered_orig_end = overlapping[-1][1]
                 if orig_start < covered_orig_start:
-                    gap_seg = dict(seg)
-                    gap_seg["start_line"] = seg["start_line"]
-                    gap_seg["end_line"] = covered_orig_start + offset - 1
-                    gap_seg["orig_start_line"] = orig_start
-                    gap_seg["orig_end_line"] = covered_orig_start - 1
                     n_lines = covered_orig_start - orig_start
-                    gap_seg["content_lines"] = seg["content_lines"][:n_lines]
-                    remaining.append(gap_seg)
+                    remaining.append({
+                        "commit_sha": commit_sha,
+                        "start_line": seg["start_line"],
+                        "end_line": covered_orig_start + offset - 1,
+                        "orig_start_line": orig_start,
+                        "orig_end_line": covered_orig_start - 1,
+                        "content_lines": seg["content_lines"][:n_lines],
+                    })
                 if covered_orig_end < orig_end:
-                    gap_seg = dict(seg)
                     n_before = covered_orig_end - orig_start + 1
-                    gap_seg["start_line"] = covered_orig_end + offset + 1
-                    gap_seg["end_line"] = seg["end_line"]
-                    gap_seg["orig_start_line"] = covered_orig_end + 1
-                    gap_seg["orig_end_line"] = orig_end
-                    gap_seg["content_lines"] = seg["content_lines"][n_before:]
-                    remaining.append(gap_seg)
+                    remaining.append({
+                        "commit_sha": commit_sha,
+                        "start_line": covered_orig_end + offset + 1,
+                        "end_line": seg["end_line"],
+                        "orig_start_line": covered_orig_end + 1,
+                        "orig_end_line": orig_end,
+                        "content_lines": seg["content_lines"][n_before:],
+                    })
                 continue
 
         remaining.append(seg)
@@ -763,54 +1350,104 @@ def _attribute_from_ledger(
 
 def _attribute_locally(
     blame_segments: list[dict[str, Any]],
-    traces: list[dict[str, Any]],
-    commit_links: list[dict[str, Any]],
+    traces: Iterable[dict[str, Any]],
+    commit_links: Iterable[dict[str, Any]],
     file_path: str,
     cwd: str | None = None,
     ledgers: dict[str, dict[str, Any]] | None = None,
 ) -> list[dict[str, Any]]:
     """Run multi-tier attribution against local trace data.
 
+    *traces* and *commit_links* are consumed once, so they may be streams
+    (see ``iter_jsonl``); only the indexes built from them are kept.
+
     Returns a list of attribution dicts (one per segment), ready for
     display or JSON serialization.
     """
+    # Build commit_sha -> commit_link index
+    link_by_commit: dict[str, dict[str, Any]] = {}
+    for cl in commit_links:
+        sha = cl.get("commit_sha", "")
+        if sha:
+            link_by_commit[sha] = cl
+
+    # Index the traces once up front so candidate gathering per segment is
+    # a few dict lookups rather than full scans of the trace list.  Trace
+    # positions are kept so candidates stay in file order (ties in scoring
+    # go to the earliest trace).
+    trace_pos: dict[int, int] = {}
+    traces_by_id: dict[str, dict[str, Any]] = {}
+    traces_by_revision: dict[str, list[dict[str, Any]]] = {}
+    ts_index: list[tuple[datetime, int, dict[str, Any]]] = []
+    ledger_traces: dict[str, dict[str, Any]] = {}  # last trace wins per id
+    for pos, t in enumerate(traces):
+        tid = t.get("id", "")
+        if tid:
+            ledger_traces[tid] = t
+        if tid not in traces_by_id:
+            traces_by_id[tid] = t
+        trace_pos[id(t)] = pos
+        revision = (t.get("vcs") or {}).get("revision")
+        if revision and isinstance(revision, str):
+            traces_by_revision.setdefault(revision, []).append(t)
+        ts_str = t.get("timestamp")
+        if not ts_str:
+            continue
+        try:
+            ts = datetime.fromisoformat(ts_str)
+        except (ValueError, TypeError):
+            continue
+        # Commit dates from git always carry an offset; naive timestamps
+        # could never be compared against them.
+        if ts.tzinfo is not None:
+            ts_index.append((ts, pos, t))
+    # Positions are unique, so plain tuple order never compares the traces
+    ts_index.sort()
+    ts_keys = [e[0] for e in ts_index]
+    # Path B / Path C pools per parent sha / commit date: the traces that
+    # touch file_path, in file order
+    revision_traces: dict[str, list[dict[str, Any]]] = {}
+    window_traces: dict[str, list[dict[str, Any]]] = {}
+
     # --- Ledger-first path: deterministic attribution ---
     ledger_results: list[dict[str, Any]] = []
     heuristic_segments = blame_segments
     if ledgers:
         ledger_results, heuristic_segments = _attribute_from_ledger(
-            blame_segments, ledgers, file_path, traces=traces,
+            blame_segments, ledgers, file_path,
+            traces=list(ledger_traces.values()),
         )
 
-    # Build commit_sha -> commit_link index
-    link_by_commit: dict[str, dict[str, Any]] = {}
-    for cl in commit_links:
-        sha = cl.get("commit_sha", "")
-        if sha:
-            link_by_commit[sha] = cl
+    file_match: dict[int, dict[str, Any] | None] = {}
+    entry_cache: dict[int, tuple[Any, ...]] = {}
+    meta_cache: dict[int, dict[str, Any]] = {}
 
-    # Cache parent SHAs to avoid repeated git calls
-    parent_cache: dict[str, str | None] = {}
-    date_cache: dict[str, str | None] = {}
+    # commit sha -> (linked traces touching file_path, linked ids, n linked)
+    linked_by_commit: dict[
+        str, tuple[list[dict[str, Any]], frozenset[str], int]
+    ] = {}
+
+    # Parent SHAs and commit dates for every blamed commit, in one git call
+    commit_meta = _prefetch_commit_metadata(
+        {seg["commit_sha"] for seg in heuristic_segments}, cwd=cwd,
+    )
 
     results: list[dict[str, Any]] = []
+    # (index into results, conversation URL) for attributed segments
+    summary_wanted: list[tuple[int, str | None]] = []
 
-    for seg in heuristic_segments:
+    for seg, content_hash in zip(
+        heuristic_segments, _segment_content_hashes(heuristic_segments),
+    ):
         commit_sha = seg["commit_sha"]
         start_line = seg["start_line"]
         end_line = seg["end_line"]
-        content_hash = _content_hash_for_segment(seg["content_lines"])
         representative_line = (start_line + end_line) // 2
 
-        # Get parent SHA (cached)
-        if commit_sha not in parent_cache:
-            parent_cache[commit_sha] = _get_parent_sha(commit_sha, cwd=cwd)
-        parent_sha = parent_cache[commit_sha]
-
-        # Get commit date (cached)
-        if commit_sha not in date_cache:
-            date_cache[commit_sha] = _get_commit_date(commit_sha, cwd=cwd)
-        commit_date = date_cache[commit_sha]
+        # Parent SHA + commit date (fall back to per-commit lookups on a miss)
+        parent_sha, commit_date = (
+            commit_meta.get(commit_sha) or _commit_metadata(commit_sha, cwd)
+        )
 
         # Check for commit link
         commit_link = link_by_commit.get(commit_sha)
@@ -819,73 +1456,95 @@ def _attribute_locally(
         )
         has_commit_link = commit_link is not None
 
+        # Path A: From commit link.  The same for every segment of a commit,
+        # so resolved once per commit: the linked traces that touch the
+        # blamed file (same as remote), all linked ids, and the linked count.
+        # Every trace id is indexed in traces_by_id, so for any candidate
+        # membership in linked_ids matches membership in linked_trace_ids.
+        linked_entry = linked_by_commit.get(commit_sha)
+        if linked_entry is None:
+            linked = [
+                traces_by_id[tid] for tid in set(linked_trace_ids)
+                if tid in traces_by_id
+            ]
+            linked.sort(key=lambda t: trace_pos[id(t)])
+            linked_entry = linked_by_commit[commit_sha] = (
+                [t for t in linked if _cached_file_match(file_match, t, file_path)],
+                frozenset(t.get("id", "") for t in linked),
+                len(linked),
+            )
+        linked_touching, linked_ids, n_linked = linked_entry
+
         # Find candidate traces
-        candidates: list[dict[str, Any]] = []
-        seen_ids: set[str] = set()
-
-        # Path A: From commit link
-        if linked_trace_ids:
-            linked_set = set(linked_trace_ids)
-            for t in traces:
-                tid = t.get("id", "")
-                if tid in linked_set and tid not in seen_ids:
-                    candidates.append(t)
-                    seen_ids.add(tid)
-
-        # Path B: Parent revision match + file path match
-        if parent_sha:
-            for t in traces:
-                tid = t.get("id", "")
-                if tid in seen_ids:
-                    continue
-                vcs = t.get("vcs") or {}
-                if vcs.get("revision") == parent_sha:
-                    if _find_matching_file(t.get("files", []), file_path):
-                        candidates.append(t)
+        candidates: list[dict[str, Any]] = list(linked_touching)
+        seen_ids: set[str] = set(linked_ids)
+
+        def _fallback_candidates() -> list[dict[str, Any]]:
+            """Paths B and C: candidates beyond the commit link."""
+            found: list[dict[str, Any]] = []
+
+            # Path B: Parent revision match + file path match
+            if parent_sha:
+                pool = revision_traces.get(parent_sha)
+                if pool is None:
+                    pool = revision_traces[parent_sha] = [
+                        t for t in traces_by_revision.get(parent_sha, ())
+                        if _cached_file_match(file_match, t, file_path)
+                    ]
+                for t in pool:
+                    tid = t.get("id", "")
+                    if tid not in seen_ids:
+                        found.append(t)
                         seen_ids.add(tid)
 
-        # Path C: Timestamp window fallback (if few candidates)
-        if len(candidates) < 5 and commit_date:
-            try:
-                commit_dt = datetime.fromisoformat(commit_date)
-                window_start = commit_dt - timedelta(hours=24)
-                window_end = commit_dt + timedelta(hours=1)
-                for t in traces:
-                    tid = t.get("id", "")
-                    if tid in seen_ids:
-                        continue
-                    ts_str = t.get("timestamp")
-                    if not ts_str:
-                        continue
+            # Path C: Timestamp window fallback (if few candidates)
+            if n_linked + len(found) < 5 and commit_date:
+                window = window_traces.get(commit_date)
+                if window is None:
                     try:
-                        ts = datetime.fromisoformat(ts_str)
-                        if window_start <= ts <= window_end:
-                            if _find_matching_file(t.get("files", []), file_path):
-                                candidates.append(t)
-                                seen_ids.add(tid)
+                        commit_dt = datetime.fromisoformat(commit_date)
+                        lo = bisect_left(ts_keys, commit_dt - timedelta(hours=24))
+                        hi = bisect_right(ts_keys, commit_dt + timedelta(hours=1))
                     except (ValueError, TypeError):
-                        continue
-            except (ValueError, TypeError):
-                pass
-
-        # Only consider traces that actually touch the blamed file (same as remote)
-        candidates = [t for t in candidates if _trace_touches_file(t, file_path)]
+                        lo = hi = 0
+                    window = window_traces[commit_date] = [
+                        e[2] for e in sorted(ts_index[lo:hi], key=lambda e: e[1])
+                        if _cached_file_match(file_match, e[2], file_path)
+                    ]
+                for t in window:
+                    tid = t.get("id", "")
+                    if tid not in seen_ids:
+                        found.append(t)
+                        seen_ids.add(tid)
+            return found
 
-        # Score candidates
+        # Score candidates, linked traces first.  Paths B/C never yield a
+        # commit-linked trace (linked ids are already in seen_ids), so once a
+        # linked trace reaches tier 1 nothing else can outscore it and the
+        # fallback paths are skipped.
         best_score: float = 0.0
         best_trace: dict[str, Any] | None = None
-        best_signals: list[str] = []
-
-        for t in candidates:
-            score, sigs = _score_trace_local(
-                t, file_path, representative_line, content_hash,
-                commit_sha, parent_sha,
-                has_commit_link, linked_trace_ids,
-            )
-            if score > best_score:
-                best_score = score
-                best_trace = t
-                best_signals = sigs
+        best_signals = 0
+        fallback_done = False
+
+        to_score = candidates
+        while True:
+            for t in to_score:
+                score, sigs = _score_trace_local(
+                    t, file_path, representative_line, content_hash,
+                    commit_sha, parent_sha,
+                    has_commit_link, linked_ids,
+                    entry_cache=entry_cache, file_match=file_match,
+                )
+                if score > best_score:
+                    best_score = score
+                    best_trace = t
+                    best_signals = sigs
+            if fallback_done or _compute_tier(best_score, best_signals) == 1:
+                break
+            to_score = _fallback_candidates()
+            candidates.extend(to_score)
+            fallback_done = True
 
         # Build attribution result
         tier = None
@@ -894,22 +1553,35 @@ def _attribute_locally(
 
         # Require some evidence (same as remote): range, or commit_link+content_hash, or commit_link+revision_parent
         if best_trace is not None and tier is not None:
-            has_range_evidence = "range_match" in best_signals or "range_overlap" in best_signals
-            has_strong_evidence = "commit_link" in best_signals and "content_hash" in best_signals
-            has_commit_and_revision = "commit_link" in best_signals and "revision_parent" in best_signals
+            has_range_evidence = bool(best_signals & (SIG_RANGE_MATCH | SIG_RANGE_OVERLAP))
+            has_strong_evidence = (
+                best_signals & (SIG_COMMIT_LINK | SIG_CONTENT_HASH)
+                == SIG_COMMIT_LINK | SIG_CONTENT_HASH
+            )
+            has_commit_and_revision = (
+                best_signals & (SIG_COMMIT_LINK | SIG_REVISION_PARENT)
+                == SIG_COMMIT_LINK | SIG_REVISION_PARENT
+            )
             if not (has_range_evidence or has_strong_evidence or has_commit_and_revision):
                 tier = None
 
         if best_trace is not None and tier is not None:
             confidence = _tier_to_confidence(tier)
-            meta = _extract_trace_meta(best_trace, file_path, representative_line)
+            meta = _extract_trace_meta(
+                best_trace, file_path, representative_line,
+                file_match, entry_cache, meta_cache,
+            )
 
             # Enrich from other linked traces if best trace is missing info
             if (not meta.get("model_id") or not meta.get("conversation_url")) and linked_trace_ids:
+                if not fallback_done:
+                    candidates.extend(_fallback_candidates())
                 for t in candidates:
                     if t.get("id") == best_trace.get("id"):
                         continue
-                    other_meta = _extract_trace_meta(t, file_path, representative_line)
+                    other_meta = _cached_trace_meta(
+                        meta_cache, t, file_path, file_match,
+                    )
                     if not meta.get("model_id") and other_meta.get("model_id"):
                         meta["model_id"] = other_meta["model_id"]
                     if not meta.get("conversation_url") and other_meta.get("conversation_url"):
@@ -917,8 +1589,8 @@ def _attribute_locally(
                     if meta.get("model_id") and meta.get("conversation_url"):
                         break
 
-            # Load conversation summary from file URL
-            conv_summary = _load_conversation_summary(meta.get("conversation_url"))
+            # Conversation summaries are loaded once per URL after the loop
+            summary_wanted.append((len(results), meta.get("conversation_url")))
 
             results.append({
                 "start_line": start_line,
@@ -931,12 +1603,12 @@ def _attribute_locally(
                 "contributor_type": meta.get("contributor_type", "unknown"),
                 "tool": meta.get("tool"),
                 "conversation_url": meta.get("conversation_url"),
-                "conversation_summary": conv_summary,
+                "conversation_summary": None,
                 "matched_range": meta.get("matched_range"),
                 "commit_sha": commit_sha,
-                "signals": best_signals,
-                "commit_link_match": "commit_link" in best_signals,
-                "content_hash_match": "content_hash" in best_signals,
+                "signals": _signal_names(best_signals),
+                "commit_link_match": bool(best_signals & SIG_COMMIT_LINK),
+                "content_hash_match": bool(best_signals & SIG_CONTENT_HASH),
             })
         else:
             # No attribution (no matching trace, or only weak signals like timestamp)
@@ -958,6 +1630,11 @@ def _attribute_locally(
                 "content_hash_match": False,
             })
 
+    summaries = _load_conversation_summaries(url for _, url in summary_wanted)
+    for i, url in summary_wanted:
+        if url:
+            results[i]["conversation_summary"] = summaries[url]
+
     # Combine ledger results with heuristic results, sorted by start_line
     all_results = ledger_results + results
     all_results.sort(key=lambda a: (a.get("start_line", 0), a.get("end_line", 0)))
@@ -970,10 +1647,16 @@ def _attribute_locally(
 # ===================================================================
 
 def _merge_attributions(attributions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Merge adjacent segments that share the same attribution (trace + tier)."""
+    """Merge adjacent segments that share the same attribution (trace + tier).
+
+    Entries that are not extended are returned as-is; an entry is shallow
+    copied the first time a neighbour is merged into it, so *attributions*
+    itself is never modified.
+    """
     if not attributions:
         return []
     merged: list[dict[str, Any]] = []
+    prev_copied = False
     for entry in attributions:
         if merged:
             prev = merged[-1]
@@ -982,9 +1665,13 @@ def _merge_attributions(attributions: list[dict[str, Any]]) -> list[dict[str, An
                 and prev["trace_id"] == entry["trace_id"]
                 and prev["tier"] == entry["tier"]
             ):
+                if not prev_copied:
+                    prev = merged[-1] = dict(prev)
+                    prev_copied = True
                 prev["end_line"] = entry["end_line"]
                 continue
-        merged.append(dict(entry))  # shallow copy
+        merged.append(entry)
+        prev_copied = False
     return merged
 
 
@@ -992,6 +1679,91 @@ def _merge_attributions(attributions: list[dict[str, Any]]) -> list[dict[str, An
 # Remote mode
 # ===================================================================
 
+# Request bodies smaller than this are sent as-is; gzip would cost more
+# CPU than it saves on the wire.
+_COMPRESS_MIN_BYTES = 1024
+
+# Kept-alive connections to the service, keyed by (scheme, host[:port]), so
+# repeated blames in one process skip the TCP/TLS handshake.
+_remote_conns: dict[tuple[str, str], http.client.HTTPConnection] = {}
+
+
+def _remote_post(
+    url: str, body: bytes, headers: dict[str, str], timeout: float = 30,
+) -> tuple[int, bytes]:
+    """POST *body* to *url* and return ``(status, response body)``.
+
+    The connection to the host is kept alive for the next call.  A reused
+    connection the server has since dropped is retried once on a fresh one;
+    nothing else is re-sent (a timeout or a redirect means the service may
+    already have the request, so a 3xx is returned to the caller as is).
+    Proxied URLs go through urllib instead.  A gzip-encoded response body
+    is inflated.
+    """
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    proxied = (
+        scheme in urllib.request.getproxies()
+        and not urllib.request.proxy_bypass(parts.hostname or "")
+    )
+    status = 0
+    raw = b""
+    encoding: str | None = None
+    if scheme in ("http", "https") and not proxied:
+        key = (scheme, parts.netloc)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        for _ in range(2):
+            conn = _remote_conns.pop(key, None)
+            reused = conn is not None
+            if reused:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+            else:
+                conn_cls = (
+                    http.client.HTTPSConnection if scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conn = conn_cls(parts.netloc, timeout=timeout)
+            try:
+                conn.request("POST", target, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                # A kept-alive connection the server closed in the meantime
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            status = resp.status
+            encoding = resp.getheader("Content-Encoding")
+            if resp.will_close:
+                conn.close()
+            else:
+                _remote_conns[key] = conn
+            break
+
+    if not status:
+        req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                status = resp.status
+                raw = resp.read()
+                encoding = resp.headers.get("Content-Encoding")
+        except urllib.error.HTTPError as e:
+            status = e.code
+            raw = e.read()
+            encoding = e.headers.get("Content-Encoding")
+
+    if encoding and encoding.strip().lower() == "gzip":
+        raw = gzip.decompress(raw)
+    return status, raw
+
+
 def _blame_remote(
     config: dict[str, Any],
     file_path: str,
@@ -1025,50 +1797,60 @@ def _blame_remote(
               file=sys.stderr)
         return ledger_results
 
-    # Cache parent SHAs and dates
-    parent_cache: dict[str, str | None] = {}
-    date_cache: dict[str, str | None] = {}
+    # Parent SHAs and commit dates for every blamed commit, in one git call
+    commit_meta = _prefetch_commit_metadata(
+        {seg["commit_sha"] for seg in remote_segments}, cwd=cwd,
+    )
 
     # Build the POST payload
     blame_data: list[dict[str, Any]] = []
-    for seg in remote_segments:
+    for seg, content_hash in zip(
+        remote_segments, _segment_content_hashes(remote_segments),
+    ):
         commit_sha = seg["commit_sha"]
 
-        if commit_sha not in parent_cache:
-            parent_cache[commit_sha] = _get_parent_sha(commit_sha, cwd=cwd)
-        if commit_sha not in date_cache:
-            date_cache[commit_sha] = _get_commit_date(commit_sha, cwd=cwd)
+        parent_sha, commit_date = (
+            commit_meta.get(commit_sha) or _commit_metadata(commit_sha, cwd)
+        )
 
         blame_data.append({
             "start_line": seg["start_line"],
             "end_line": seg["end_line"],
             "commit_sha": commit_sha,
-            "parent_sha": parent_cache[commit_sha],
-            "content_hash": _content_hash_for_segment(seg["content_lines"]),
-            "timestamp": date_cache[commit_sha],
+            "parent_sha": parent_sha,
+            "content_hash": content_hash,
+            "timestamp": commit_date,
         })
 
-    body = json.dumps({
+    body = json_dumps_bytes({
         "project_id": project_id,
         "file_path": file_path,
         "blame_data": blame_data,
-    }).encode("utf-8")
+    })
 
-    req = urllib.request.Request(
-        f"{service_url}/api/v1/blame",
-        data=body,
-        method="POST",
+    # Opt-in: the service must be able to inflate gzip request bodies.
+    compress = (
+        bool(config.get("compress_requests", False))
+        and len(body) > _COMPRESS_MIN_BYTES
     )
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {auth_token}")
+    if compress:
+        body = gzip.compress(body, compresslevel=6)
+
+    headers = {
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip",
+        "Authorization": f"Bearer {auth_token}",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
 
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        print(f"agent-trace blame: service responded {e.code}: {e.read().decode()}",
-              file=sys.stderr)
-        return []
+        status, raw = _remote_post(f"{service_url}/api/v1/blame", body, headers)
+        if status >= 300:
+            print(f"agent-trace blame: service responded {status}: "
+                  f"{raw.decode(errors='replace')}", file=sys.stderr)
+            return []
+        data = json_loads(raw)
     except Exception as e:
         print(f"agent-trace blame: service unreachable: {e}", file=sys.stderr)
         return []
@@ -1085,6 +1867,9 @@ def _blame_remote(
 # Output formatting
 # ===================================================================
 
+# Shared stand-in for a missing remote "contributor" object; never mutated
+_NO_CONTRIBUTOR: dict[str, Any] = {}
+
 # ANSI colour codes
 _BOLD = "\033[1m"
 _DIM = "\033[2m"
@@ -1104,51 +1889,88 @@ _TIER_DISPLAY = {
     6: f"{_DIM}[Tier 6 ?]{_RESET}",
 }
 
+# Ledger labels, pre-coloured (any other label is shown dimmed)
+_LEDGER_LABEL_DISPLAY = {
+    "AI": f"{_GREEN}[AI]{_RESET}",
+    "Mixed": f"{_YELLOW}[Mixed]{_RESET}",
+}
+
+# Uncoloured variants, for output that is not a terminal
+_ANSI_RE = re.compile("\033\\[[0-9;]*m")
+_TIER_DISPLAY_PLAIN = {t: _ANSI_RE.sub("", v) for t, v in _TIER_DISPLAY.items()}
+_LEDGER_LABEL_DISPLAY_PLAIN = {
+    k: _ANSI_RE.sub("", v) for k, v in _LEDGER_LABEL_DISPLAY.items()
+}
 
-def _format_line_range(start: int, end: int) -> str:
-    if start == end:
-        return f"L{start}"
-    return f"L{start}-{end}"
+# Indent of the detail lines under each attribution
+_DETAIL_INDENT = " " * 14
+
+
+def _stdout_wants_color() -> bool:
+    """True when stdout is a terminal and ``NO_COLOR`` is not set."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):  # replaced or closed stream
+        return False
 
 
-def _format_terminal(file_path: str, attributions: list[dict[str, Any]]) -> str:
-    """Format attributions for terminal display."""
-    lines: list[str] = []
-    lines.append("")
-    lines.append(f"  {_BOLD}{file_path}{_RESET}")
-    lines.append("")
+def _format_terminal(
+    file_path: str,
+    attributions: Iterable[dict[str, Any]],
+    color: bool = True,
+) -> str:
+    """Format attributions for terminal display (ANSI colours if *color*)."""
+    if color:
+        bold, dim, reset = _BOLD, _DIM, _RESET
+        tier_display, ledger_display = _TIER_DISPLAY, _LEDGER_LABEL_DISPLAY
+    else:
+        bold = dim = reset = ""
+        tier_display = _TIER_DISPLAY_PLAIN
+        ledger_display = _LEDGER_LABEL_DISPLAY_PLAIN
+    no_ai_label = f"{dim}[no ai attribution]{reset}"
+    dim_labels: dict[str, str] = {}  # ledger label -> dimmed "[label]"
+    summary_lines: dict[str, str] = {}  # conversation summary -> display line
+    lines: list[str] = ["", f"  {bold}{file_path}{reset}", ""]
+    emit = lines.append
 
     for attr in attributions:
-        start = attr.get("start_line", 0)
-        end = attr.get("end_line", 0)
-        tier = attr.get("tier")
-        lr = _format_line_range(start, end)
-        source = attr.get("source", "")
+        get = attr.get
+        start = get("start_line", 0)
+        end = get("end_line", 0)
+        tier = get("tier")
+        lr = f"L{start}" if start == end else f"L{start}-{end}"
+        source = get("source", "")
 
         if tier is None:
             # Check if this is a ledger "human" attribution
             if source == "ledger":
-                label = attr.get("attribution_label", "Human")
-                lines.append(f"  {lr:<12}{_DIM}[{label}]{_RESET}")
+                label = get("attribution_label", "Human")
+                dim_label = dim_labels.get(label)
+                if dim_label is None:
+                    dim_label = dim_labels[label] = f"{dim}[{label}]{reset}"
+                emit(f"  {lr:<12}{dim_label}")
             else:
-                lines.append(f"  {lr:<12}{_DIM}[no ai attribution]{_RESET}")
+                emit(f"  {lr:<12}{no_ai_label}")
             continue
 
         # Ledger-sourced attribution gets a deterministic label
         if source == "ledger":
-            label = attr.get("attribution_label", "AI")
-            if label == "AI":
-                tier_label = f"{_GREEN}[{label}]{_RESET}"
-            elif label == "Mixed":
-                tier_label = f"{_YELLOW}[{label}]{_RESET}"
-            else:
-                tier_label = f"{_DIM}[{label}]{_RESET}"
+            label = get("attribution_label", "AI")
+            tier_label = ledger_display.get(label) or dim_labels.get(label)
+            if tier_label is None:
+                tier_label = dim_labels[label] = f"{dim}[{label}]{reset}"
         else:
-            tier_label = _TIER_DISPLAY.get(tier, f"[Tier {tier}]")
+            tier_label = tier_display.get(tier) or f"[Tier {tier}]"
 
         # Model + tool (remote returns model_id in contributor; support both)
-        model_id = attr.get("model_id") or (attr.get("contributor") or {}).get("model_id") or ""
-        tool = attr.get("tool")
+        model_id = (
+            get("model_id")
+            or (get("contributor") or _NO_CONTRIBUTOR).get("model_id")
+            or ""
+        )
+        tool = get("tool")
         tool_name = ""
         if isinstance(tool, dict):
             tool_name = tool.get("name", "")
@@ -1159,40 +1981,43 @@ def _format_terminal(file_path: str, attributions: list[dict[str, Any]]) -> str:
         if tool_name:
             model_tool = f"{model_id} via {tool_name}" if model_id else tool_name
 
-        lines.append(f"  {lr:<12}{tier_label} {model_tool}")
+        emit(f"  {lr:<12}{tier_label} {model_tool}")
 
         # Model info on its own line if present
         if model_id:
-            lines.append(f"              {_DIM}model: {model_id}{_RESET}")
+            emit(f"{_DETAIL_INDENT}{dim}model: {model_id}{reset}")
 
         # Conversation summary (if available)
-        conv_summary = attr.get("conversation_summary") or ""
-        conv_url = attr.get("conversation_url") or ""
+        conv_summary = get("conversation_summary") or ""
+        conv_url = get("conversation_url") or ""
         if conv_summary:
-            # Show first line of summary inline, truncated
-            summary_line = conv_summary.replace("\n", " ").strip()
-            if len(summary_line) > 120:
-                summary_line = summary_line[:120] + "..."
-            lines.append(f"              conversation: \"{summary_line}\"")
+            # Show the summary inline on one line, truncated (rows from the
+            # same conversation share it, so it is built once per render)
+            summary_line = summary_lines.get(conv_summary)
+            if summary_line is None:
+                summary_line = conv_summary.replace("\n", " ").strip()
+                if len(summary_line) > 120:
+                    summary_line = summary_line[:120] + "..."
+                summary_lines[conv_summary] = summary_line
+            emit(f"{_DETAIL_INDENT}conversation: \"{summary_line}\"")
         elif conv_url:
-            lines.append(f"              conversation: {conv_url}")
+            emit(f"{_DETAIL_INDENT}conversation: {conv_url}")
 
         # Trace / commit (full IDs)
-        trace_id = attr.get("trace_id") or ""
-        commit_sha = attr.get("commit_sha") or ""
-        detail_parts = []
-        if trace_id:
-            detail_parts.append(f"trace: {trace_id}")
-        if commit_sha:
-            detail_parts.append(f"commit: {commit_sha[:12]}")
-        if detail_parts:
-            lines.append(f"              {_DIM}{' | '.join(detail_parts)}{_RESET}")
-
-    lines.append("")
+        trace_id = get("trace_id") or ""
+        commit_sha = get("commit_sha") or ""
+        if trace_id and commit_sha:
+            emit(f"{_DETAIL_INDENT}{dim}trace: {trace_id} | commit: {commit_sha[:12]}{reset}")
+        elif trace_id:
+            emit(f"{_DETAIL_INDENT}{dim}trace: {trace_id}{reset}")
+        elif commit_sha:
+            emit(f"{_DETAIL_INDENT}{dim}commit: {commit_sha[:12]}{reset}")
+
+    emit("")
     return "\n".join(lines)
 
 
-def _format_json(file_path: str, attributions: list[dict[str, Any]]) -> str:
+def _format_json(file_path: str, attributions: Iterable[dict[str, Any]]) -> str:
     """Format attributions as JSON."""
     # Strip internal fields, keep clean output
     clean: list[dict[str, Any]] = []
@@ -1205,10 +2030,11 @@ def _format_json(file_path: str, attributions: list[dict[str, Any]]) -> str:
         }
         if attr.get("trace_id"):
             entry["trace_id"] = attr["trace_id"]
-        model_id = attr.get("model_id") or (attr.get("contributor") or {}).get("model_id")
+        contributor = attr.get("contributor") or _NO_CONTRIBUTOR
+        model_id = attr.get("model_id") or contributor.get("model_id")
         if model_id:
             entry["model_id"] = model_id
-        contributor_type = attr.get("contributor_type") or (attr.get("contributor") or {}).get("type")
+        contributor_type = attr.get("contributor_type") or contributor.get("type")
         if contributor_type:
             entry["contributor_type"] = contributor_type
         tool = attr.get("tool")
@@ -1237,7 +2063,7 @@ def _format_json(file_path: str, attributions: list[dict[str, Any]]) -> str:
         clean.append(entry)
 
     output = {"file": file_path, "attributions": clean}
-    return json.dumps(output, indent=2)
+    return json_dumps_indented(output)
 
 
 # ===================================================================
@@ -1263,7 +2089,9 @@ def blame_file(
     line : int | None
         Specific line number to blame.
     start_line, end_line : int | None
-        Line range to blame (from --range).
+        Line range to blame (from --range).  Library callers such as the
+        file viewer pass ints here directly rather than building a
+        ``--range`` string for the CLI to split and parse.
     min_tier : int
         Minimum confidence tier to display (1-6).
     json_output : bool
@@ -1287,78 +2115,88 @@ def blame_file(
         print(f"agent-trace blame: file not found: {file_path}", file=sys.stderr)
         sys.exit(1)
 
-    # Determine the git-relative path
-    git_root = _git("rev-parse", "--show-toplevel", cwd=cwd)
-    if git_root is None:
-        if json_output:
-            return None
-        print("agent-trace blame: not a git repository", file=sys.stderr)
-        sys.exit(1)
-
-    try:
-        rel_path = os.path.relpath(abs_path, git_root)
-    except ValueError:
-        rel_path = file_path
-
     # Handle --line -> single-line range
     if line is not None:
         start_line = line
         end_line = line
 
-    # Run git blame --porcelain
-    raw = _git_blame_porcelain(
-        rel_path,
-        start_line=start_line,
-        end_line=end_line,
-        cwd=git_root,
-    )
-    if raw is None:
-        if json_output:
-            return None
-        print(f"agent-trace blame: git blame failed for {file_path}", file=sys.stderr)
-        sys.exit(1)
-
-    # Parse and group
-    records = _parse_blame_porcelain(raw)
-    if not records:
-        if json_output:
-            return None
-        print(f"agent-trace blame: no blame data for {file_path}", file=sys.stderr)
-        sys.exit(1)
-
-    segments = _group_into_segments(records)
-
     # Determine storage mode
     config = get_project_config(project_dir=cwd)
     if config is None:
         config = {"storage": "local"}
     storage = config.get("storage", "local")
 
-    # Load ledgers for deterministic attribution
-    ledgers = load_local_ledgers(git_root)
+    # git blame only needs the file's path relative to cwd, so it runs
+    # (parsing and grouping as the output streams in) alongside the
+    # git-root lookup and the ledger/trace loading that depend on it.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+        blame_fut = pool.submit(
+            _git_blame_segments,
+            os.path.relpath(abs_path, cwd),
+            start_line=start_line,
+            end_line=end_line,
+            cwd=cwd,
+        )
+        git_root = _git_root(cwd)
+        if git_root is None:
+            if json_output:
+                return None
+            print("agent-trace blame: not a git repository", file=sys.stderr)
+            sys.exit(1)
+
+        # Load ledgers for deterministic attribution, and the local store
+        ledgers_fut = pool.submit(load_local_ledgers, git_root)
+        if storage != "remote":
+            traces_fut = pool.submit(_load_local_traces, git_root)
+            links_fut = pool.submit(_load_local_commit_links, git_root)
+
+        segments = blame_fut.result()
+        if segments is None:
+            if json_output:
+                return None
+            print(f"agent-trace blame: git blame failed for {file_path}", file=sys.stderr)
+            sys.exit(1)
+
+        if not segments:
+            if json_output:
+                return None
+            print(f"agent-trace blame: no blame data for {file_path}", file=sys.stderr)
+            sys.exit(1)
+
+        ledgers = ledgers_fut.result()
+        if storage != "remote":
+            traces = traces_fut.result()
+            commit_links = links_fut.result()
+
+    # Determine the git-relative path
+    try:
+        rel_path = os.path.relpath(abs_path, git_root)
+    except ValueError:
+        rel_path = file_path
 
     # Run attribution
     if storage == "remote":
         attributions = _blame_remote(config, rel_path, segments, cwd=git_root, ledgers=ledgers)
     else:
-        traces = _load_local_traces(git_root)
-        commit_links = _load_local_commit_links(git_root)
         raw_attrs = _attribute_locally(
             segments, traces, commit_links, rel_path, cwd=git_root,
             ledgers=ledgers,
         )
         attributions = _merge_attributions(raw_attrs)
 
-    # Filter by min_tier
+    # Filter by min_tier, lazily: either formatter walks the result once
+    shown: Iterable[dict[str, Any]] = attributions
     if min_tier < 6:
-        attributions = [
+        shown = (
             a for a in attributions
-            if a.get("tier") is None or (a.get("tier") is not None and a["tier"] <= min_tier)
-        ]
+            if a.get("tier") is None or a["tier"] <= min_tier
+        )
 
     # Output
     if json_output:
-        result = _format_json(rel_path, attributions)
+        result = _format_json(rel_path, shown)
         return result
-    print(_format_terminal(rel_path, attributions))
+    sys.stdout.write(
+        _format_terminal(rel_path, shown, color=_stdout_wants_color()) + "\n"
+    )
     return None
@@ -26,22 +26,9 @@ import argparse
 import os
 import sys
 
-from .config import (
-    DEFAULT_SERVICE_URL,
-    get_auth_token,
-    get_global_config,
-    get_project_config,
-    get_service_url,
-    save_global_config,
-    save_project_config,
-)
-from .blame import blame_file
-from .commit_link import create_commit_link
-from .context import context_command
-from .hooks import configure_claude_hooks, configure_cursor_hooks, configure_git_hooks
-from .rules import add_rule, remove_rule, show_rules, list_available_rules, TOOL_CHOICES
-from .record import record_from_stdin
-from .rewrite import rewrite_ledgers
+# Command modules (and .config, which they all load) are imported inside
+# the commands that use them, so --help, --version and hook entry points
+# only pay for what they run.
 
 VERSION = "0.1.0"
 
@@ -93,11 +80,36 @@ def _confirm(message, default=True):
     return value in ("y", "yes")
 
 
+def _count_lines(path):
+    """Count the lines in a file (a final unterminated line counts too).
+
+    A missing file has no lines.
+    """
+    count = 0
+    last = b"\n"
+    try:
+        f = open(path, "rb", buffering=0)
+    except FileNotFoundError:
+        return 0
+    with f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count if last == b"\n" else count + 1
+
+
 # ===================================================================
 # init
 # ===================================================================
 
 def cmd_init(_args):
+    from .config import (
+        DEFAULT_SERVICE_URL,
+        get_global_config,
+        get_project_config,
+        save_project_config,
+    )
+
     config = get_project_config()
     if config is not None:
         print("agent-trace is already initialized for this project.")
@@ -124,6 +136,8 @@ def cmd_init(_args):
     save_project_config(project_config)
     print("\nConfiguration saved to .agent-trace/config.json")
 
+    from .hooks import configure_claude_hooks, configure_cursor_hooks, configure_git_hooks
+
     print()
     if _confirm("Configure hook for Cursor?", default=True):
         configure_cursor_hooks()
@@ -147,6 +161,13 @@ def cmd_init(_args):
 # ===================================================================
 
 def cmd_status(_args):
+    from .config import (
+        get_auth_token,
+        get_global_config,
+        get_project_config,
+        get_service_url,
+    )
+
     config = get_project_config()
     if config is None:
         print("agent-trace is not set up for this project.")
@@ -170,45 +191,28 @@ def cmd_status(_args):
             print("  Auth Token: not configured")
 
     elif config.get("storage") == "local":
-        traces_file = os.path.join(".agent-trace", "traces.jsonl")
-        if os.path.exists(traces_file):
-            with open(traces_file) as f:
-                count = sum(1 for _ in f)
-            print(f"  Traces:     {count} recorded")
-        else:
-            print("  Traces:     0 recorded")
+        count = _count_lines(os.path.join(".agent-trace", "traces.jsonl"))
+        print(f"  Traces:     {count} recorded")
 
     if config.get("storage") == "local":
-        links_file = os.path.join(".agent-trace", "commit-links.jsonl")
-        if os.path.exists(links_file):
-            with open(links_file) as f:
-                link_count = sum(1 for _ in f)
-            print(f"  Commit links: {link_count} recorded")
-        else:
-            print("  Commit links: 0 recorded")
+        link_count = _count_lines(os.path.join(".agent-trace", "commit-links.jsonl"))
+        print(f"  Commit links: {link_count} recorded")
 
-        ledgers_file = os.path.join(".agent-trace", "ledgers.jsonl")
-        if os.path.exists(ledgers_file):
-            with open(ledgers_file) as f:
-                ledger_count = sum(1 for _ in f)
-            print(f"  Ledgers:      {ledger_count} recorded")
-        else:
-            print("  Ledgers:      0 recorded")
+        ledger_count = _count_lines(os.path.join(".agent-trace", "ledgers.jsonl"))
+        print(f"  Ledgers:      {ledger_count} recorded")
 
     cursor_ok = os.path.exists(".cursor/hooks.json")
     claude_ok = os.path.exists(".claude/settings.json")
     git_hook_ok = False
     git_rewrite_ok = False
     try:
-        if os.path.exists(".git/hooks/post-commit"):
-            with open(".git/hooks/post-commit") as f:
-                git_hook_ok = "agent-trace commit-link" in f.read()
-    except OSError:
+        with open(".git/hooks/post-commit") as f:
+            git_hook_ok = "agent-trace commit-link" in f.read()
+    except OSError:  # includes a missing hook
         pass
     try:
-        if os.path.exists(".git/hooks/post-rewrite"):
-            with open(".git/hooks/post-rewrite") as f:
-                git_rewrite_ok = "agent-trace rewrite-ledger" in f.read()
+        with open(".git/hooks/post-rewrite") as f:
+            git_rewrite_ok = "agent-trace rewrite-ledger" in f.read()
     except OSError:
         pass
     print(f"\n  Cursor hook:       {'configured' if cursor_ok else 'not configured'}")
@@ -222,6 +226,13 @@ def cmd_status(_args):
 # ===================================================================
 
 def cmd_reset(_args):
+    from .config import (
+        DEFAULT_SERVICE_URL,
+        get_global_config,
+        get_project_config,
+        save_project_config,
+    )
+
     config = get_project_config()
     if config is None:
         print("agent-trace is not set up for this project.")
@@ -252,6 +263,8 @@ def cmd_reset(_args):
     save_project_config(new_config)
     print("\nConfiguration updated.")
 
+    from .hooks import configure_claude_hooks, configure_cursor_hooks
+
     print()
     if _confirm("Reconfigure hook for Cursor?", default=False):
         configure_cursor_hooks()
@@ -268,6 +281,9 @@ def cmd_reset(_args):
 
 def cmd_record(_args):
     try:
+        # Imported here so other commands skip the record machinery
+        from .record import record_from_stdin
+
         record_from_stdin()
     except Exception:
         # Never crash the coding agent
@@ -281,6 +297,8 @@ def cmd_record(_args):
 def cmd_commit_link(_args):
     """Create a commit-trace link for the current HEAD commit."""
     try:
+        from .commit_link import create_commit_link
+
         link = create_commit_link()
         if link:
             n = len(link.get("trace_ids", []))
@@ -297,6 +315,8 @@ def cmd_commit_link(_args):
 def cmd_rewrite_ledger(_args):
     """Remap ledgers after rebase/amend (called by git post-rewrite hook)."""
     try:
+        from .rewrite import rewrite_ledgers
+
         count = rewrite_ledgers()
         if count:
             print(f"agent-trace: remapped {count} ledger(s)")
@@ -333,6 +353,8 @@ def cmd_viewer(args):
 
 def cmd_blame(args):
     """Show AI attribution for a file."""
+    from .blame import blame_file
+
     # Parse --range if provided (e.g. "10-25")
     start_line = None
     end_line = None
@@ -363,6 +385,8 @@ def cmd_blame(args):
 
 def cmd_context(args):
     """Get conversation context for AI-attributed code."""
+    from .context import context_command
+
     context_command(
         args.file,
         lines_range=getattr(args, "lines", None),
@@ -378,6 +402,8 @@ def cmd_context(args):
 
 def cmd_rule(args):
     """Manage agent rules."""
+    from .rules import add_rule, list_available_rules, remove_rule, show_rules
+
     rule_action = getattr(args, "rule_action", None)
 
     if rule_action == "add":
@@ -431,6 +457,8 @@ def cmd_rule(args):
 # ===================================================================
 
 def cmd_set_globaluser(args):
+    from .config import get_global_config, save_global_config
+
     config = get_global_config()
     config["auth_token"] = args.token
     save_global_config(config)
@@ -442,6 +470,8 @@ def cmd_set_globaluser(args):
 # ===================================================================
 
 def cmd_remove_globaluser(_args):
+    from .config import get_global_config, save_global_config
+
     config = get_global_config()
     if "auth_token" in config:
         del config["auth_token"]
@@ -455,55 +485,42 @@ def cmd_remove_globaluser(_args):
 # Entry point
 # ===================================================================
 
-def main():
-    parser = argparse.ArgumentParser(
-        prog="agent-trace",
-        description="agent-trace — AI code tracing tool",
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"agent-trace {VERSION}",
-    )
-
-    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
-
-    sub.add_parser("init", help="Initialize agent-trace for the current project")
-    sub.add_parser("status", help="Show agent-trace status")
-    sub.add_parser("reset", help="Reset agent-trace configuration")
-    sub.add_parser("record", help="Record a trace from stdin (used by hooks)")
-    sub.add_parser("commit-link", help="Link current commit to traces (called by git hook)")
-    sub.add_parser("rewrite-ledger", help="Remap ledgers after rebase/amend (called by git hook)")
-
+def _add_viewer_args(p):
     # viewer [--project /path]
-    sub_viewer = sub.add_parser("viewer", help="Open the file viewer (browse files, git + agent-trace blame)")
-    sub_viewer.add_argument("--project", "-p", default=None, help="Project directory (default: current directory)")
+    p.add_argument("--project", "-p", default=None, help="Project directory (default: current directory)")
 
-    # blame <file>
-    sub_blame = sub.add_parser("blame", help="Show AI attribution for a file")
-    sub_blame.add_argument("file", help="File path to blame")
-    sub_blame.add_argument("--line", "-l", type=int, default=None,
-                           help="Specific line number")
-    sub_blame.add_argument("--range", "-r", default=None,
-                           help="Line range (e.g. 10-25)")
-    sub_blame.add_argument("--json", action="store_true", default=False,
-                           help="Output as JSON")
-    sub_blame.add_argument("--min-tier", type=int, default=6,
-                           help="Minimum confidence tier to show (1-6)")
 
+def _add_blame_args(p):
+    # blame <file>
+    p.add_argument("file", help="File path to blame")
+    p.add_argument("--line", "-l", type=int, default=None,
+                   help="Specific line number")
+    p.add_argument("--range", "-r", default=None,
+                   help="Line range (e.g. 10-25)")
+    p.add_argument("--json", action="store_true", default=False,
+                   help="Output as JSON")
+    p.add_argument("--min-tier", type=int, default=6,
+                   help="Minimum confidence tier to show (1-6)")
+
+
+def _add_context_args(p):
     # context <file>
-    sub_context = sub.add_parser("context", help="Get conversation context for AI-attributed code")
-    sub_context.add_argument("file", help="File path to get context for")
-    sub_context.add_argument("--lines", "-l", default=None,
-                             help="Line range (e.g. 10-25)")
-    sub_context.add_argument("--full", action="store_true", default=False,
-                             help="Include full conversation transcript")
-    sub_context.add_argument("--json", action="store_true", default=False,
-                             help="Output as JSON (for machine consumption)")
-    sub_context.add_argument("--query", "-q", default=None,
-                             help="Query to pass through for subagent instruction")
+    p.add_argument("file", help="File path to get context for")
+    p.add_argument("--lines", "-l", default=None,
+                   help="Line range (e.g. 10-25)")
+    p.add_argument("--full", action="store_true", default=False,
+                   help="Include full conversation transcript")
+    p.add_argument("--json", action="store_true", default=False,
+                   help="Output as JSON (for machine consumption)")
+    p.add_argument("--query", "-q", default=None,
+                   help="Query to pass through for subagent instruction")
+
+
+def _add_rule_args(p):
+    from .rules import TOOL_CHOICES
 
     # rule {add,remove,show,list}
-    sub_rule = sub.add_parser("rule", help="Manage agent rules for coding agents")
-    rule_sub = sub_rule.add_subparsers(dest="rule_action", metavar="ACTION")
+    rule_sub = p.add_subparsers(dest="rule_action", metavar="ACTION")
 
     # rule add <name> --tool <cursor|claude>
     rule_add = rule_sub.add_parser("add", help="Add a prebuilt rule")
@@ -523,17 +540,72 @@ def main():
     # rule list
     rule_sub.add_parser("list", help="List available prebuilt rules")
 
+
+def _add_set_args(p):
     # set globaluser <token>
-    set_p = sub.add_parser("set", help="Set global configuration")
-    set_sub = set_p.add_subparsers(dest="set_command", metavar="KEY")
+    set_sub = p.add_subparsers(dest="set_command", metavar="KEY")
     gu = set_sub.add_parser("globaluser", help="Set global auth token")
     gu.add_argument("token", help="The auth token to store globally")
 
+
+def _add_remove_args(p):
     # remove globaluser
-    rm_p = sub.add_parser("remove", help="Remove global configuration")
-    rm_sub = rm_p.add_subparsers(dest="remove_command", metavar="KEY")
+    rm_sub = p.add_subparsers(dest="remove_command", metavar="KEY")
     rm_sub.add_parser("globaluser", help="Remove global auth token")
 
+
+# Subcommands in help order: (name, help, builder for its arguments or None)
+_COMMANDS = (
+    ("init", "Initialize agent-trace for the current project", None),
+    ("status", "Show agent-trace status", None),
+    ("reset", "Reset agent-trace configuration", None),
+    ("record", "Record a trace from stdin (used by hooks)", None),
+    ("commit-link", "Link current commit to traces (called by git hook)", None),
+    ("rewrite-ledger", "Remap ledgers after rebase/amend (called by git hook)", None),
+    ("viewer", "Open the file viewer (browse files, git + agent-trace blame)", _add_viewer_args),
+    ("blame", "Show AI attribution for a file", _add_blame_args),
+    ("context", "Get conversation context for AI-attributed code", _add_context_args),
+    ("rule", "Manage agent rules for coding agents", _add_rule_args),
+    ("set", "Set global configuration", _add_set_args),
+    ("remove", "Remove global configuration", _add_remove_args),
+)
+
+
+# Hook entry points take no arguments and run on every agent action or
+# commit, so a bare invocation of one is dispatched without argparse.
+_HOOK_COMMANDS = {
+    "record": cmd_record,
+    "commit-link": cmd_commit_link,
+    "rewrite-ledger": cmd_rewrite_ledger,
+}
+
+
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] in _HOOK_COMMANDS:
+        command = sys.argv[1]
+        _HOOK_COMMANDS[command](argparse.Namespace(command=command))
+        return
+
+    parser = argparse.ArgumentParser(
+        prog="agent-trace",
+        description="agent-trace — AI code tracing tool",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"agent-trace {VERSION}",
+    )
+
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    # Every command is listed (for help and validation), but only the one
+    # being run gets its arguments; the top level has no options that take
+    # a value, so the first non-option argument names it.
+    requested = next((a for a in sys.argv[1:] if not a.startswith("-")), None)
+    subparsers = {}
+    for name, help_text, add_args in _COMMANDS:
+        subparsers[name] = sub.add_parser(name, help=help_text)
+        if add_args is not None and name == requested:
+            add_args(subparsers[name])
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -560,12 +632,12 @@ def main():
         if getattr(args, "set_command", None) == "globaluser":
             cmd_set_globaluser(args)
         else:
-            set_p.print_help()
+            subparsers["set"].print_help()
     elif args.command == "remove":
         if getattr(args, "remove_command", None) == "globaluser":
             cmd_remove_globaluser(args)
         else:
-            rm_p.print_help()
+            subparsers["remove"].print_help()
 
 
 if __name__ == "__main__":
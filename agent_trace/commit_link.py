@@ -20,7 +20,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from .config import get_auth_token, get_project_config, get_service_url
-from .ledger import build_attribution_ledger, store_ledger_local
+from .jsonl import append_bytes, iter_jsonl
+from .ledger import _git_bytes, build_attribution_ledger, store_ledger_local
+
+# Compact JSON for the commit-link records written and uploaded below
+_JSON_SEPARATORS = (",", ":")
 
 
 # -------------------------------------------------------------------
@@ -41,59 +45,45 @@ def _git(*args: str, cwd: str | None = None) -> str | None:
     return None
 
 
-def _get_commit_sha(cwd: str | None = None) -> str | None:
-    return _git("rev-parse", "HEAD", cwd=cwd)
-
+def _get_commit_info(cwd: str | None = None) -> tuple[str, str | None, str | None] | None:
+    """(commit SHA, first parent SHA, author date) of HEAD in one git call.
 
-def _get_parent_sha(cwd: str | None = None) -> str | None:
-    return _git("rev-parse", "HEAD^", cwd=cwd)
+    The parent is None for an initial commit; the author date is ISO-8601.
+    Returns None if HEAD cannot be read.
+    """
+    out = _git("log", "-1", "--format=%H%x00%P%x00%aI", "HEAD", cwd=cwd)
+    if not out:
+        return None
+    commit_sha, parents, committed_at = (out.split("\0") + ["", ""])[:3]
+    if not commit_sha:
+        return None
+    # %P lists every parent of a merge; HEAD^ is the first
+    parent_sha = parents.split(" ", 1)[0] or None
+    return commit_sha, parent_sha, committed_at or None
 
 
-def _get_changed_files(cwd: str | None = None) -> list[str]:
-    """Files changed between HEAD^ and HEAD."""
-    # Handle initial commit (no parent)
-    parent = _get_parent_sha(cwd)
-    if parent is None:
+def _get_changed_files(parent_sha: str | None, cwd: str | None = None) -> list[str]:
+    """Files changed between *parent_sha* (HEAD^) and HEAD."""
+    if parent_sha is None:
         # First commit — diff against empty tree
-        out = _git("diff", "--name-only", "--diff-filter=ACMR",
-                    "4b825dc642cb6eb9a060e54bf899d15f3f4b7b18", "HEAD",
-                    cwd=cwd)
+        out = _git_bytes("diff", "--name-only", "-z", "--diff-filter=ACMR",
+                         "4b825dc642cb6eb9a060e54bf899d15f3f4b7b18", "HEAD",
+                         cwd=cwd)
     else:
-        out = _git("diff", "--name-only", "HEAD^", "HEAD", cwd=cwd)
+        out = _git_bytes("diff", "--name-only", "-z", parent_sha, "HEAD", cwd=cwd)
 
     if out is None:
         return []
-    return [f for f in out.splitlines() if f.strip()]
-
-
-def _get_commit_date(cwd: str | None = None) -> str | None:
-    """Author date of HEAD in ISO-8601 format."""
-    return _git("log", "-1", "--format=%aI", "HEAD", cwd=cwd)
+    # -z output read as bytes: NUL-separated, unquoted and with no newline
+    # translation, so unusual paths (even ones containing \r) come through
+    # verbatim
+    return [os.fsdecode(f) for f in out.split(b"\0") if f]
 
 
 # -------------------------------------------------------------------
 # Trace matching
 # -------------------------------------------------------------------
 
-def _load_local_traces(project_dir: str) -> list[dict]:
-    """Load all traces from .agent-trace/traces.jsonl."""
-    traces_path = Path(project_dir) / ".agent-trace" / "traces.jsonl"
-    if not traces_path.exists():
-        return []
-    traces = []
-    try:
-        for line in traces_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    traces.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    except OSError:
-        pass
-    return traces
-
-
 def _trace_matches(trace: dict, parent_sha: str | None, changed_files: set[str]) -> bool:
     """Check if a trace matches the parent revision and touches any changed file."""
     # Must have a VCS revision matching the parent
@@ -104,13 +94,11 @@ def _trace_matches(trace: dict, parent_sha: str | None, changed_files: set[str])
     if revision != parent_sha:
         return False
 
-    # Must touch at least one changed file
-    for fe in trace.get("files", []):
-        fpath = fe.get("path", "")
-        if fpath in changed_files:
-            return True
-
-    return False
+    # Must touch at least one changed file; isdisjoint walks the paths in
+    # C and stops at the first hit
+    return not changed_files.isdisjoint(
+        fe.get("path", "") for fe in trace.get("files", [])
+    )
 
 
 def _find_matching_traces_local(
@@ -121,28 +109,36 @@ def _find_matching_traces_local(
     """Find trace IDs that match the parent SHA and touch changed files."""
     if parent_sha is None:
         return []
-    traces = _load_local_traces(project_dir)
+    traces_path = os.path.join(project_dir, ".agent-trace", "traces.jsonl")
     changed_set = set(changed_files)
     return [
         t["id"]
-        for t in traces
-        if t.get("id") and _trace_matches(t, parent_sha, changed_set)
+        # A matching trace's vcs.revision equals parent_sha, so lines
+        # without it can be skipped before parsing.
+        for t in iter_jsonl(traces_path, parent_sha.encode("ascii", "replace"))
+        if isinstance(t, dict) and t.get("id") and _trace_matches(t, parent_sha, changed_set)
     ]
 
 
+def _remote_params(config: dict) -> tuple[str | None, str | None, str]:
+    """(project_id, auth token, service URL) for talking to the service."""
+    return config.get("project_id"), get_auth_token(config), get_service_url(config)
+
+
 def _find_matching_traces_remote(
-    config: dict,
+    remote: tuple[str | None, str | None, str],
     parent_sha: str | None,
     changed_files: list[str],
     committed_at: str | None,
 ) -> list[str]:
-    """Query the remote service for matching traces and filter client-side."""
+    """Query the remote service for matching traces and filter client-side.
+
+    *remote* is the ``_remote_params`` tuple for the project.
+    """
     if parent_sha is None:
         return []
 
-    project_id = config.get("project_id")
-    auth_token = get_auth_token(config)
-    service_url = get_service_url(config)
+    project_id, auth_token, service_url = remote
 
     if not project_id or not auth_token:
         return []
@@ -180,15 +176,17 @@ def _store_local(commit_link: dict, project_dir: str) -> None:
     """Append commit link to .agent-trace/commit-links.jsonl."""
     d = Path(project_dir) / ".agent-trace"
     d.mkdir(parents=True, exist_ok=True)
-    with open(d / "commit-links.jsonl", "a") as f:
-        f.write(json.dumps(commit_link) + "\n")
+    line = json.dumps(commit_link, separators=_JSON_SEPARATORS, ensure_ascii=False)
+    # Unbuffered O_APPEND write, so concurrent hooks don't interleave records
+    append_bytes(d / "commit-links.jsonl", (line + "\n").encode("utf-8"))
+
 
+def _store_remote(commit_link: dict, remote: tuple[str | None, str | None, str]) -> None:
+    """POST commit link to the remote agent-trace-service.
 
-def _store_remote(commit_link: dict, config: dict) -> None:
-    """POST commit link to the remote agent-trace-service."""
-    project_id = config.get("project_id")
-    auth_token = get_auth_token(config)
-    service_url = get_service_url(config)
+    *remote* is the ``_remote_params`` tuple for the project.
+    """
+    project_id, auth_token, service_url = remote
 
     if not project_id or not auth_token:
         return
@@ -197,7 +195,7 @@ def _store_remote(commit_link: dict, config: dict) -> None:
         "project_id": project_id,
         **commit_link,
     }
-    data = json.dumps(body).encode("utf-8")
+    data = json.dumps(body, separators=_JSON_SEPARATORS, ensure_ascii=False).encode("utf-8")
     req = urllib.request.Request(
         f"{service_url}/api/v1/commit-links",
         data=data,
@@ -226,25 +224,23 @@ def create_commit_link(project_dir: str | None = None) -> dict | None:
     """Create a commit-trace link for the current HEAD commit.
 
     Algorithm:
-      1. git rev-parse HEAD → commit SHA
-      2. git rev-parse HEAD^ → parent SHA (handle first commit)
-      3. git diff --name-only HEAD^ HEAD → changed files
-      4. git log -1 --format=%aI HEAD → commit author date
-      5. Find matching traces (local or remote)
-      6. Build and store the commit link record
+      1. git log -1 --format=%H%x00%P%x00%aI HEAD → commit SHA, parent SHA
+         (handle first commit), commit author date
+      2. git diff --name-only -z HEAD^ HEAD → changed files
+      3. Find matching traces (local or remote)
+      4. Build and store the commit link record
 
     Returns the commit link dict, or None if no matching traces found.
     """
     if project_dir is None:
         project_dir = os.getcwd()
 
-    commit_sha = _get_commit_sha(project_dir)
-    if not commit_sha:
+    info = _get_commit_info(project_dir)
+    if info is None:
         return None
 
-    parent_sha = _get_parent_sha(project_dir)
-    changed_files = _get_changed_files(project_dir)
-    committed_at = _get_commit_date(project_dir)
+    commit_sha, parent_sha, committed_at = info
+    changed_files = _get_changed_files(parent_sha, project_dir)
 
     if not changed_files:
         return None
@@ -259,8 +255,10 @@ def create_commit_link(project_dir: str | None = None) -> dict | None:
 
     # Find matching traces
     if storage == "remote":
+        # Resolved once: the auth token lookup reads the global config
+        remote = _remote_params(config)
         trace_ids = _find_matching_traces_remote(
-            config, parent_sha, changed_files, committed_at
+            remote, parent_sha, changed_files, committed_at
         )
     else:
         trace_ids = _find_matching_traces_local(
@@ -273,7 +271,13 @@ def create_commit_link(project_dir: str | None = None) -> dict | None:
     # heuristic scoring which can produce false positives.
     ledger = None
     try:
-        ledger = build_attribution_ledger(project_dir)
+        ledger = build_attribution_ledger(
+            project_dir,
+            commit_sha=commit_sha,
+            parent_sha=parent_sha,
+            committed_at=committed_at,
+            changed_files=changed_files,
+        )
     except Exception:
         pass  # Never fail the commit link over a ledger error
 
@@ -303,7 +307,7 @@ def create_commit_link(project_dir: str | None = None) -> dict | None:
     if storage == "remote":
         if ledger:
             commit_link["ledger"] = ledger
-        _store_remote(commit_link, config)
+        _store_remote(commit_link, remote)
     else:
         _store_local(commit_link, project_dir)
 
@@ -0,0 +1,139 @@
+"""
+JSON and file-writing helpers shared by the modules that read and write
+``.agent-trace/`` stores.
+
+Uses ``orjson`` when it is installed and falls back to the stdlib ``json``
+module otherwise.  Kept apart from ``trace.py`` so the ``record`` hook,
+which only writes, never pays for importing orjson.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+try:  # optional C-accelerated JSON parser; stdlib json is the fallback
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+# -------------------------------------------------------------------
+# Encoding / decoding
+# -------------------------------------------------------------------
+
+def json_loads(raw: bytes) -> Any:
+    """Parse one JSON document, using orjson when it is installed."""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            # orjson is stricter than json (NaN, big ints) — let json decide.
+            pass
+    return json.loads(raw)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize *obj* to compact UTF-8 JSON, using orjson when installed."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj)
+        except TypeError:
+            # Non-str keys, ints beyond 64 bits, ... — json handles those.
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_dumps_indented(obj: Any) -> str:
+    """``json.dumps(obj, indent=2)``, produced by orjson when it can be.
+
+    orjson writes the same layout and values (only extreme float exponents
+    are spelled differently, e.g. ``1e-7``).  Its output is used only when
+    it is pure ASCII, as json's always is, so it stays printable on any
+    console; otherwise, or for values orjson cannot encode, json does the
+    work.
+    """
+    if _orjson is not None:
+        try:
+            raw = _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+        except TypeError:  # JSONEncodeError, e.g. ints beyond 64 bits
+            pass
+        else:
+            if raw.isascii():
+                return raw.decode("ascii")
+    return json.dumps(obj, indent=2)
+
+
+# -------------------------------------------------------------------
+# JSONL files
+# -------------------------------------------------------------------
+
+def iter_jsonl(path: str | Path, needle: bytes | None = None) -> Iterator[Any]:
+    """Yield records from a JSONL file, skipping blank and malformed lines.
+
+    The file is read in binary mode and parsed line by line, so no decoded
+    copy of the whole file or intermediate list of lines is built.  With
+    *needle*, lines that do not contain it are skipped without parsing.
+    A missing or unreadable file yields nothing.
+    """
+    try:
+        with open(path, "rb") as f:
+            for raw in f:
+                if needle and needle not in raw:
+                    continue
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    yield json_loads(raw)
+                except ValueError:  # JSONDecodeError, invalid UTF-8
+                    continue
+    except OSError:
+        return
+
+
+# -------------------------------------------------------------------
+# Writing files
+# -------------------------------------------------------------------
+
+def append_bytes(path: str | Path, data: bytes) -> None:
+    """Append *data* to *path* (created if missing) through an O_APPEND fd.
+
+    O_APPEND puts every ``write()`` at the current end of file, so data
+    written in a single call cannot interleave with another process
+    appending to the same file.  A regular file takes a small record in
+    one call; if the OS ever accepts only part of it, the rest follows in
+    further calls and that guarantee no longer holds for the record.
+    O_BINARY keeps Windows from translating newlines.  Raises OSError.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def replace_bytes(path: Path, data: bytes) -> None:
+    """Replace *path*'s contents with *data* atomically.
+
+    *data* goes to a temporary file beside *path*, named with this
+    process's pid so concurrent writers never share it, which is then
+    renamed over *path*.  Readers see the old or the new file, never a
+    partial one.  The temporary file is removed on failure; raises OSError.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -9,7 +9,7 @@ This replaces heuristic scoring for commits that have a ledger — the blame
 algorithm checks the ledger first and only falls back to heuristics when no
 ledger exists.
 
-No external dependencies — stdlib only.
+No external dependencies — stdlib only (``orjson`` is used when installed).
 """
 
 from __future__ import annotations
@@ -22,6 +22,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from .jsonl import iter_jsonl
+
 
 # -------------------------------------------------------------------
 # Git helpers
@@ -55,6 +57,35 @@ def _git_raw(*args: str, cwd: str | None = None) -> str | None:
     return None
 
 
+def _git_bytes(
+    *args: str,
+    cwd: str | None = None,
+    input: bytes | None = None,
+) -> bytes | None:
+    """Run a git command and return raw (undecoded) stdout, or None on failure.
+
+    stderr is discarded rather than captured (failures only ever surface as
+    None).  stdin is fed *input* when given and is otherwise closed, so git
+    can never block on a prompt.  Also used by ``blame`` and ``commit_link``.
+    """
+    stdin_kw: dict[str, Any] = (
+        {"input": input} if input is not None else {"stdin": subprocess.DEVNULL}
+    )
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd, timeout=30,
+            **stdin_kw,
+        )
+        if result.returncode == 0:
+            return result.stdout
+    except Exception:
+        pass
+    return None
+
+
 # -------------------------------------------------------------------
 # Diff parsing
 # -------------------------------------------------------------------
@@ -358,19 +389,8 @@ def _find_candidate_traces(
       content hashes should be used (not range claims).
     """
     traces_path = Path(project_dir) / ".agent-trace" / "traces.jsonl"
-    if not traces_path.exists():
-        return [], []
-
-    all_traces: list[dict[str, Any]] = []
-    try:
-        for line in traces_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    all_traces.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    except OSError:
+    all_traces: list[dict[str, Any]] = list(iter_jsonl(traces_path))
+    if not all_traces:
         return [], []
 
     revision_matched: list[dict[str, Any]] = []
@@ -417,7 +437,14 @@ def _find_candidate_traces(
 # Ledger construction
 # -------------------------------------------------------------------
 
-def build_attribution_ledger(project_dir: str | None = None) -> dict[str, Any] | None:
+def build_attribution_ledger(
+    project_dir: str | None = None,
+    *,
+    commit_sha: str | None = None,
+    parent_sha: str | None = None,
+    committed_at: str | None = None,
+    changed_files: list[str] | None = None,
+) -> dict[str, Any] | None:
     """Build a per-line attribution ledger for the current HEAD commit.
 
     Algorithm:
@@ -432,32 +459,37 @@ def build_attribution_ledger(project_dir: str | None = None) -> dict[str, Any] |
          f. Merge contiguous lines with same attribution into segments
       4. Build and return ledger dict
 
+    Callers that already looked up HEAD (the commit-link hook) pass
+    *commit_sha* and *changed_files*, along with *parent_sha* and
+    *committed_at*, to skip repeating step 1's git calls.
+
     Returns None if no data available (no parent, no changed files, etc.).
     """
     if project_dir is None:
         import os
         project_dir = os.getcwd()
 
-    commit_sha = _git("rev-parse", "HEAD", cwd=project_dir)
-    if not commit_sha:
-        return None
+    if commit_sha is None or changed_files is None:
+        commit_sha = _git("rev-parse", "HEAD", cwd=project_dir)
+        if not commit_sha:
+            return None
 
-    parent_sha = _git("rev-parse", "HEAD^", cwd=project_dir)
-    committed_at = _git("log", "-1", "--format=%aI", "HEAD", cwd=project_dir)
+        parent_sha = _git("rev-parse", "HEAD^", cwd=project_dir)
+        committed_at = _git("log", "-1", "--format=%aI", "HEAD", cwd=project_dir)
 
-    # Get changed files
-    if parent_sha:
-        changed_out = _git("diff", "--name-only", "HEAD^", "HEAD", cwd=project_dir)
-    else:
-        # Initial commit
-        changed_out = _git("diff", "--name-only", "--diff-filter=ACMR",
-                           "4b825dc642cb6eb9a060e54bf899d15f3f4b7b18", "HEAD",
-                           cwd=project_dir)
-
-    if not changed_out:
-        return None
+        # Get changed files
+        if parent_sha:
+            changed_out = _git("diff", "--name-only", "HEAD^", "HEAD", cwd=project_dir)
+        else:
+            # Initial commit
+            changed_out = _git("diff", "--name-only", "--diff-filter=ACMR",
+                               "4b825dc642cb6eb9a060e54bf899d15f3f4b7b18", "HEAD",
+                               cwd=project_dir)
+
+        if not changed_out:
+            return None
 
-    changed_files = [f for f in changed_out.splitlines() if f.strip()]
+        changed_files = [f for f in changed_out.splitlines() if f.strip()]
     if not changed_files:
         return None
 
@@ -642,26 +674,33 @@ def store_ledger_local(ledger: dict[str, Any], project_dir: str) -> None:
         f.write(json.dumps(ledger) + "\n")
 
 
+# Loaded ledgers by path, reused while the file's (mtime, size) is unchanged
+# so long-lived callers such as the viewer do not re-parse them per blame.
+_ledgers_cache: dict[Path, tuple[int, int, dict[str, dict[str, Any]]]] = {}
+
+
 def load_local_ledgers(project_dir: str) -> dict[str, dict[str, Any]]:
     """Load all ledgers from ``.agent-trace/ledgers.jsonl``.
 
-    Returns a dict keyed by ``commit_sha``.
+    Returns a dict keyed by ``commit_sha``.  The dict is shared between
+    calls while the file is unchanged and must not be mutated.
     """
     ledgers_path = Path(project_dir) / ".agent-trace" / "ledgers.jsonl"
-    if not ledgers_path.exists():
-        return {}
-    ledgers: dict[str, dict[str, Any]] = {}
     try:
-        for line in ledgers_path.read_text().splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    ledger = json.loads(line)
-                    sha = ledger.get("commit_sha", "")
-                    if sha:
-                        ledgers[sha] = ledger
-                except json.JSONDecodeError:
-                    continue
+        st = ledgers_path.stat()
     except OSError:
-        pass
+        _ledgers_cache.pop(ledgers_path, None)
+        return {}
+    cached = _ledgers_cache.get(ledgers_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    ledgers: dict[str, dict[str, Any]] = {}
+    for ledger in iter_jsonl(ledgers_path):
+        if not isinstance(ledger, dict):
+            continue
+        sha = ledger.get("commit_sha", "")
+        if sha:
+            ledgers[sha] = ledger
+    _ledgers_cache[ledgers_path] = (st.st_mtime_ns, st.st_size, ledgers)
     return ledgers
@@ -120,9 +120,17 @@ def compute_content_hash(content: str) -> str:
     same logical content hashes identically whether stored (e.g. tool
     new_string with trailing \\n) or matched (e.g. \"\\n\".join(blame lines)).
     """
-    normalized = content.replace("\r\n", "\n").replace("\r", "\n").rstrip("\n")
-    h = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
-    return f"sha256:{h}"
+    return compute_content_hash_bytes(content.encode("utf-8"))
+
+
+def compute_content_hash_bytes(content: bytes) -> str:
+    """``compute_content_hash`` for UTF-8 encoded *content*.
+
+    CR and LF are single bytes in UTF-8, so normalizing the encoded bytes
+    gives the same hash as normalizing the text first.
+    """
+    normalized = content.replace(b"\r\n", b"\n").replace(b"\r", b"\n").rstrip(b"\n")
+    return "sha256:" + hashlib.sha256(normalized).digest()[:8].hex()
 
 
 def compute_range_positions(
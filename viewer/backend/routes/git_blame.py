@@ -28,14 +28,47 @@ def _git(*args: str, cwd: str | None = None) -> str | None:
     return None
 
 
-def _parse_blame_porcelain(raw: str) -> list[dict[str, Any]]:
-    """Parse git blame --porcelain output into per-line records.
+def _git_bytes(*args: str, cwd: str | None = None) -> bytes | None:
+    """Run a git command and return raw (undecoded) stdout, or None on failure."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            cwd=cwd,
+            timeout=30,
+        )
+        if result.returncode == 0:
+            return result.stdout
+    except Exception:
+        pass
+    return None
+
+
+# Deleting these from a SHA must leave nothing (bytes.translate, in C)
+_HEX_DIGITS = b"0123456789abcdef"
+
+# Porcelain header keys kept per commit -> segment field
+_PORCELAIN_FIELDS = {
+    b"author": "author",
+    b"author-time": "author_time",
+    b"summary": "summary",
+}
+
+
+def _parse_blame_segments(raw: bytes) -> list[dict[str, Any]]:
+    """Parse git blame --porcelain output into segments.
+
+    Works on git's raw bytes; only the header values that are kept get
+    decoded.  Consecutive lines from the same commit are grouped as they
+    are parsed, without building per-line records.
 
-    Each record: commit_sha, orig_line, final_line, content, author, author_time, summary, filename.
+    Returns segments: { start_line, end_line, author, author_time, summary, commit_sha }.
     """
-    lines = raw.split("\n")
-    records: list[dict[str, Any]] = []
-    commit_info: dict[str, dict[str, Any]] = {}
+    lines = raw.split(b"\n")
+    segments: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    current_info: dict[str, Any] | None = None
+    commit_info: dict[bytes, dict[str, Any]] = {}
 
     i = 0
     while i < len(lines):
@@ -44,112 +77,62 @@ def _parse_blame_porcelain(raw: str) -> list[dict[str, Any]]:
             i += 1
             continue
 
-        parts = line.split()
-        if len(parts) < 3:
+        # Entry header: <sha> <orig_line> <final_line> [<num_lines>]
+        # (split no further than those fields)
+        try:
+            sha, _, final, *_ = line.split(None, 3)
+        except ValueError:
             i += 1
             continue
-
-        sha = parts[0]
-        if len(sha) != 40 or not all(c in "0123456789abcdef" for c in sha):
+        if len(sha) != 40 or sha.translate(None, _HEX_DIGITS):
             i += 1
             continue
 
-        orig_line = int(parts[1])
-        final_line = int(parts[2])
+        final_line = int(final)
         i += 1
 
-        if sha not in commit_info:
-            info: dict[str, Any] = {}
+        info = commit_info.get(sha)
+        if info is None:
+            info = {"commit_sha": sha.decode("ascii")}
             while i < len(lines):
                 hline = lines[i]
-                if hline.startswith("\t"):
+                if hline.startswith(b"\t"):
                     break
-                if hline.startswith("author "):
-                    info["author"] = hline[7:]
-                elif hline.startswith("author-time "):
+                key, sep, value = hline.partition(b" ")
+                field = _PORCELAIN_FIELDS.get(key) if sep else None
+                if field == "author_time":
                     try:
-                        info["author_time"] = int(hline[12:])
+                        info[field] = int(value)
                     except ValueError:
                         pass
-                elif hline.startswith("summary "):
-                    info["summary"] = hline[8:]
-                elif hline.startswith("filename "):
-                    info["filename"] = hline[9:]
+                elif field is not None:
+                    info[field] = value.decode("utf-8", "replace")
                 i += 1
             commit_info[sha] = info
         else:
-            while i < len(lines) and not lines[i].startswith("\t"):
-                hline = lines[i]
-                if hline.startswith("filename "):
-                    commit_info[sha]["filename"] = hline[9:]
+            while i < len(lines) and not lines[i].startswith(b"\t"):
                 i += 1
 
-        content = ""
-        if i < len(lines) and lines[i].startswith("\t"):
-            content = lines[i][1:]
+        # Skip the content line
+        if i < len(lines) and lines[i].startswith(b"\t"):
             i += 1
 
-        info = commit_info.get(sha, {})
-        records.append({
-            "commit_sha": sha,
-            "orig_line": orig_line,
-            "final_line": final_line,
-            "content": content,
-            "author": info.get("author", ""),
-            "author_time": info.get("author_time"),
-            "summary": info.get("summary", ""),
-            "filename": info.get("filename", ""),
-        })
-
-    return records
-
-
-def _group_into_segments(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Group consecutive records that share the same commit SHA.
-
-    Returns segments: { start_line, end_line, author, author_time, summary, commit_sha }.
-    """
-    if not records:
-        return []
-
-    segments: list[dict[str, Any]] = []
-    current: dict[str, Any] | None = None
-
-    for rec in records:
         if (
-            current is not None
-            and current["commit_sha"] == rec["commit_sha"]
-            and current["end_line"] + 1 == rec["final_line"]
+            info is current_info
+            and current["end_line"] + 1 == final_line
         ):
-            current["end_line"] = rec["final_line"]
+            current["end_line"] = final_line
         else:
-            if current is not None:
-                segments.append({
-                    "start_line": current["start_line"],
-                    "end_line": current["end_line"],
-                    "author": current["author"],
-                    "author_time": current["author_time"],
-                    "summary": current["summary"],
-                    "commit_sha": current["commit_sha"],
-                })
+            current_info = info
             current = {
-                "commit_sha": rec["commit_sha"],
-                "start_line": rec["final_line"],
-                "end_line": rec["final_line"],
-                "author": rec.get("author", ""),
-                "author_time": rec.get("author_time"),
-                "summary": rec.get("summary", ""),
+                "start_line": final_line,
+                "end_line": final_line,
+                "author": info.get("author", ""),
+                "author_time": info.get("author_time"),
+                "summary": info.get("summary", ""),
+                "commit_sha": info["commit_sha"],
             }
-
-    if current is not None:
-        segments.append({
-            "start_line": current["start_line"],
-            "end_line": current["end_line"],
-            "author": current["author"],
-            "author_time": current["author_time"],
-            "summary": current["summary"],
-            "commit_sha": current["commit_sha"],
-        })
+            segments.append(current)
 
     return segments
 
@@ -176,12 +159,12 @@ def get_git_blame(project_root: str, rel_path: str) -> list[dict[str, Any]] | No
     except ValueError:
         file_rel = rel_path.lstrip("/")
 
-    raw = _git("blame", "--porcelain", file_rel, cwd=git_root)
+    raw = _git_bytes("blame", "--porcelain", file_rel, cwd=git_root)
     if not raw:
         return None
 
-    records = _parse_blame_porcelain(raw)
-    if not records:
+    segments = _parse_blame_segments(raw)
+    if not segments:
         return None
 
-    return _group_into_segments(records)
+    return segments